@@ -1,8 +1,11 @@
 """LangGraph agent graph definition."""
 
-from typing import Optional
-import os
+from functools import lru_cache
+from typing import List, Optional
+import asyncio
+import threading
 
+from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, END
 
 from terminal_todos.agent.nodes import create_agent_node, should_continue, tool_node
@@ -11,10 +14,12 @@ from terminal_todos.agent.tools import init_tools
 from terminal_todos.config import get_settings
 from terminal_todos.core.note_service import NoteService
 from terminal_todos.core.todo_service import TodoService
+from terminal_todos.utils.logger import log_error, log_info
 
 
 # Global flag to track if Arize tracing has been initialized
 _arize_initialized = False
+_arize_lock = threading.Lock()
 
 
 def _initialize_arize_tracing():
@@ -24,24 +29,25 @@ def _initialize_arize_tracing():
     if _arize_initialized:
         return
 
-    settings = get_settings()
+    with _arize_lock:
+        if _arize_initialized:
+            return
 
-    if settings.enable_arize_tracing:
-        try:
-            # Set environment variables for Arize credentials
-            if settings.arize_space_id:
-                os.environ["ARIZE_SPACE_ID"] = settings.arize_space_id
-            if settings.arize_api_key:
-                os.environ["ARIZE_API_KEY"] = settings.arize_api_key
+        settings = get_settings()
+
+        if not settings.enable_arize_tracing:
+            return
 
+        try:
             # Import Arize instrumentation
             from arize.otel import register
             from openinference.instrumentation.langchain import LangChainInstrumentor
 
-            # Setup OTel via Arize's convenience function
+            # Setup OTel via Arize's convenience function, passing credentials
+            # directly so they don't leak into the process environment
             tracer_provider = register(
-                space_id=os.getenv("ARIZE_SPACE_ID"),
-                api_key=os.getenv("ARIZE_API_KEY"),
+                space_id=settings.arize_space_id,
+                api_key=settings.arize_api_key,
                 project_name=settings.arize_project_name
             )
 
@@ -50,31 +56,58 @@ def _initialize_arize_tracing():
 
             _arize_initialized = True
 
-            print("✓ Arize tracing initialized")
-            print(f"  Project: {settings.arize_project_name}")
-            print(f"  Space ID: {settings.arize_space_id[:8]}..." if settings.arize_space_id else "  Space ID: Not set")
+            space_id = f"{settings.arize_space_id[:8]}..." if settings.arize_space_id else "Not set"
+            log_info(
+                f"Arize tracing initialized (project: {settings.arize_project_name}, "
+                f"space ID: {space_id})"
+            )
 
         except Exception as e:
-            print(f"⚠ Failed to initialize Arize tracing: {e}")
-            print("  Agent will continue without tracing")
+            log_error(e, "Failed to initialize Arize tracing - agent will continue without tracing", show_traceback=False)
+
+
+def start_arize_tracing() -> None:
+    """
+    Initialize Arize tracing in a background thread if it is enabled.
+
+    The Arize/OpenInference imports are slow, so they are kept off the
+    startup and graph-construction path.
+    """
+    try:
+        enabled = get_settings().enable_arize_tracing
+    except Exception:
+        # Configuration errors are reported by the CLI, not at import
+        return
+
+    if enabled and not _arize_initialized:
+        threading.Thread(target=_initialize_arize_tracing, daemon=True).start()
 
 
 def create_agent_graph(
-    llm_model: Optional[str] = None, api_key: Optional[str] = None
+    llm_model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    checkpointer=None,
 ):
     """
-    Create the agent graph with optional Arize tracing.
+    Create the agent graph.
+
+    Arize tracing, if enabled, is set up separately by start_arize_tracing()
+    when this module is imported.
 
     Args:
         llm_model: Optional LLM model override
         api_key: Optional API key override
+        checkpointer: Optional LangGraph checkpointer for per-thread state
 
     Returns:
-        Compiled LangGraph with tracing enabled (if configured)
+        Compiled LangGraph
     """
-    # Initialize Arize tracing (only once globally)
-    _initialize_arize_tracing()
+    return _compile_agent_graph(llm_model, api_key, checkpointer)
+
 
+@lru_cache(maxsize=8)
+def _compile_agent_graph(llm_model: Optional[str], api_key: Optional[str], checkpointer=None):
+    """Build and compile the agent graph, cached per (llm_model, api_key, checkpointer)."""
     # Initialize services for tools
     todo_service = TodoService()
     note_service = NoteService()
@@ -107,28 +140,83 @@ def create_agent_graph(
     workflow.add_edge("tools", "agent")
 
     # Compile the graph
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 
-# Global graph instance
+# Global graph instances
 _agent_graph = None
+_checkpointed_agent_graph = None
+_graph_lock = threading.Lock()
 
 
 def get_agent_graph():
     """Get or create the global agent graph instance."""
     global _agent_graph
     if _agent_graph is None:
-        _agent_graph = create_agent_graph()
+        with _graph_lock:
+            if _agent_graph is None:
+                _agent_graph = create_agent_graph()
     return _agent_graph
 
 
+def get_checkpointed_agent_graph():
+    """
+    Get or create the global agent graph with an in-memory checkpointer.
+
+    Conversation state is kept per thread_id, so callers send only the new
+    message each turn instead of re-sending the whole history:
+
+        graph.ainvoke(
+            {"messages": [HumanMessage(content=text)]},
+            config={"configurable": {"thread_id": session_id}},
+        )
+    """
+    global _checkpointed_agent_graph
+    if _checkpointed_agent_graph is None:
+        with _graph_lock:
+            if _checkpointed_agent_graph is None:
+                _checkpointed_agent_graph = create_agent_graph(checkpointer=MemorySaver())
+    return _checkpointed_agent_graph
+
+
+async def batch_run(states: List[AgentState]) -> List[AgentState]:
+    """
+    Run the agent on several independent conversations concurrently.
+
+    Concurrency is capped by settings.llm_concurrency to stay within
+    OpenAI rate limits.
+
+    Args:
+        states: Agent states, one per conversation
+
+    Returns:
+        Final agent states, in the same order as the input
+    """
+    graph = get_agent_graph()
+    semaphore = asyncio.Semaphore(get_settings().llm_concurrency)
+
+    async def run_one(state: AgentState) -> AgentState:
+        async with semaphore:
+            return await graph.ainvoke(state)
+
+    return await asyncio.gather(*(run_one(state) for state in states))
+
+
 def reset_agent_graph():
     """Reset the global agent graph (for testing)."""
-    global _agent_graph
-    _agent_graph = None
+    global _agent_graph, _checkpointed_agent_graph
+    with _graph_lock:
+        _agent_graph = None
+        _checkpointed_agent_graph = None
+        _compile_agent_graph.cache_clear()
 
 
 def reset_arize_tracing():
     """Reset Arize tracing initialization flag (for testing)."""
     global _arize_initialized
-    _arize_initialized = False
+    with _arize_lock:
+        _arize_initialized = False
+
+
+# Start Arize tracing setup as early as possible, off the hot path
+start_arize_tracing()
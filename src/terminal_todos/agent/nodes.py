@@ -1,19 +1,222 @@
 """Agent nodes for LangGraph."""
 
-from typing import Literal
+import asyncio
+import atexit
+import hashlib
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional
 
-from langchain_core.messages import AIMessage, ToolMessage
+import httpx
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+    convert_to_messages,
+    message_chunk_to_message,
+    message_to_dict,
+)
 from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import ToolNode
 
-from terminal_todos.agent.prompts import SYSTEM_PROMPT
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+from terminal_todos.agent.prompts import build_system_prompt
 from terminal_todos.agent.state import AgentState
-from terminal_todos.agent.tools import ALL_TOOLS
+from terminal_todos.agent.tools import ALL_TOOL_SCHEMAS, ALL_TOOLS
 from terminal_todos.config import get_settings
 
 
-# Create tool node (handles tool execution)
-tool_node = ToolNode(ALL_TOOLS)
+# Tool lookup by name for dispatching tool calls (built once at import)
+_TOOLS_BY_NAME = {t.name: t for t in ALL_TOOLS}
+
+# OpenAI prompt_cache_key: routes every request that starts with this exact
+# tool block to the same prompt cache (changes whenever the tools change)
+_PROMPT_CACHE_KEY = "terminal-todos-tools-" + hashlib.sha256(
+    json.dumps(ALL_TOOL_SCHEMAS, sort_keys=True, default=str).encode()
+).hexdigest()[:16]
+
+# Tools that only read data. Consecutive read-only calls run concurrently;
+# any other call changes data and runs alone, in the order the model asked.
+_READ_ONLY_TOOL_PREFIXES = ("list_", "search_", "get_", "find_")
+
+
+def _is_read_only(call: Dict[str, Any]) -> bool:
+    """Check whether a tool call only reads data."""
+    return call["name"].startswith(_READ_ONLY_TOOL_PREFIXES)
+
+
+def _group_tool_calls(tool_calls: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Group tool calls into levels that run one after another.
+
+    A run of consecutive read-only calls forms one level whose calls run
+    concurrently. Every other call is a barrier in a level of its own, so
+    writes never overlap each other or the reads around them.
+
+    Returns:
+        List of levels, each a list of indexes into tool_calls
+    """
+    levels: List[List[int]] = []
+    reads_open = False
+
+    for i, call in enumerate(tool_calls):
+        if _is_read_only(call):
+            if reads_open:
+                levels[-1].append(i)
+            else:
+                levels.append([i])
+                reads_open = True
+        else:
+            levels.append([i])
+            reads_open = False
+
+    return levels
+
+
+async def _run_tool_call(call: Dict[str, Any]) -> ToolMessage:
+    """Run a single tool call and wrap the output in a ToolMessage."""
+    name = call["name"]
+    tool = _TOOLS_BY_NAME.get(name)
+
+    if tool is None:
+        return ToolMessage(
+            content=f"Error: {name} is not a valid tool, try one of [{', '.join(_TOOLS_BY_NAME)}].",
+            name=name,
+            tool_call_id=call["id"],
+            status="error",
+        )
+
+    try:
+        output = await tool.ainvoke(call.get("args", {}))
+    except Exception as e:
+        return ToolMessage(
+            content=f"Error: {repr(e)}\n Please fix your mistakes.",
+            name=name,
+            tool_call_id=call["id"],
+            status="error",
+        )
+
+    return ToolMessage(content=str(output), name=name, tool_call_id=call["id"])
+
+
+async def tool_node(state: AgentState) -> AgentState:
+    """
+    Tool node that executes the tool calls from the last agent message.
+
+    Consecutive read-only tool calls run concurrently; calls that change
+    data run alone, in order.
+
+    Args:
+        state: Current agent state
+
+    Returns:
+        Updated state with one ToolMessage per tool call, in call order
+    """
+    tool_calls = state["messages"][-1].tool_calls
+    results: List[ToolMessage] = [None] * len(tool_calls)
+
+    # Sync tools run on executor threads (each with its own services), so
+    # cap how many run at once
+    semaphore = asyncio.Semaphore(max(1, get_settings().tool_concurrency))
+
+    async def run_limited(call: Dict[str, Any]) -> ToolMessage:
+        async with semaphore:
+            return await _run_tool_call(call)
+
+    for level in _group_tool_calls(tool_calls):
+        outputs = await asyncio.gather(*(run_limited(tool_calls[i]) for i in level))
+        for i, output in zip(level, outputs):
+            results[i] = output
+
+    return {"messages": results}
+
+
+@lru_cache(maxsize=64)
+def _system_message(prompt: str) -> SystemMessage:
+    """Get the SystemMessage for a prompt (one instance per compiled prompt)."""
+    return SystemMessage(content=prompt)
+
+
+@lru_cache(maxsize=1)
+def _get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client (pooled keep-alive connections, HTTP/2 if available)."""
+    return httpx.AsyncClient(
+        http2=HAS_HTTP2,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=60.0,
+    )
+
+
+@atexit.register
+def _close_async_http_client() -> None:
+    """Close the shared HTTP client on process exit."""
+    if _get_async_http_client.cache_info().currsize == 0:
+        return
+    try:
+        asyncio.run(_get_async_http_client().aclose())
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=8)
+def _build_llm_with_tools(model: str, api_key: str):
+    """Create the chat model with tools bound, cached per (model, api_key)."""
+    llm = ChatOpenAI(
+        model=model,
+        api_key=api_key,
+        temperature=0,
+        http_async_client=_get_async_http_client(),
+        extra_body={"prompt_cache_key": _PROMPT_CACHE_KEY},
+    )
+    return llm.bind(tools=list(ALL_TOOL_SCHEMAS), tool_choice="auto")
+
+
+# LLM response cache: fingerprint -> AIMessage (LRU, enabled via settings)
+_llm_response_cache: "OrderedDict[str, AIMessage]" = OrderedDict()
+
+
+def _tools_fingerprint(llm_with_tools) -> str:
+    """Hash the tool schema bound to the LLM."""
+    tools = getattr(llm_with_tools, "kwargs", {}).get("tools", [])
+    return hashlib.sha256(json.dumps(tools, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _response_cache_key(model: str, tools_hash: str, messages) -> str:
+    """Fingerprint a model call from the model, tool schema and message list."""
+    payload = json.dumps(
+        [message_to_dict(m) for m in convert_to_messages(messages)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(f"{model}:{tools_hash}:{payload}".encode()).hexdigest()
+
+
+def _get_cached_response(key: str) -> Optional[AIMessage]:
+    """Get a cached response, returned as a fresh message so it gets a new ID."""
+    cached = _llm_response_cache.get(key)
+    if cached is None:
+        return None
+    _llm_response_cache.move_to_end(key)
+    return cached.model_copy(update={"id": None})
+
+
+def _store_cached_response(key: str, response: AIMessage, max_size: int) -> None:
+    """Store a response, evicting the least recently used entries."""
+    _llm_response_cache[key] = response
+    _llm_response_cache.move_to_end(key)
+    while len(_llm_response_cache) > max_size:
+        _llm_response_cache.popitem(last=False)
+
+
+def clear_llm_response_cache() -> None:
+    """Clear the LLM response cache (for testing)."""
+    _llm_response_cache.clear()
 
 
 def create_agent_node(llm_model: str = None, api_key: str = None):
@@ -27,14 +230,20 @@ def create_agent_node(llm_model: str = None, api_key: str = None):
     model = llm_model or settings.llm_model
     key = api_key or settings.openai_api_key
 
-    # Create LLM with tools
-    llm = ChatOpenAI(model=model, api_key=key, temperature=0)
-    llm_with_tools = llm.bind_tools(ALL_TOOLS)
+    # Create LLM with tools (reused across graph builds)
+    llm_with_tools = _build_llm_with_tools(model, key)
 
-    def agent_node(state: AgentState) -> AgentState:
+    use_cache = settings.enable_llm_cache
+    tools_hash = _tools_fingerprint(llm_with_tools) if use_cache else ""
+
+    async def agent_node(state: AgentState) -> AgentState:
         """
         Agent node that decides what to do next.
 
+        Runs as an async node so the OpenAI round-trip yields to the event
+        loop and concurrent graph runs can overlap their network I/O. The
+        response is streamed; only the aggregated message enters the state.
+
         Args:
             state: Current agent state
 
@@ -43,14 +252,34 @@ def create_agent_node(llm_model: str = None, api_key: str = None):
         """
         messages = state["messages"]
 
-        # Add system message if this is the first turn
-        if len(messages) == 1:
-            messages = [{"role": "system", "content": SYSTEM_PROMPT}] + list(messages)
+        # turn_count counts agent calls within the current user turn. It is
+        # kept in checkpointed state, so a new user message restarts it.
+        turn_count = 0 if isinstance(messages[-1], HumanMessage) else state.get("turn_count", 0)
+
+        # Add system message on the first call of the turn, with only the
+        # prompt sections relevant to the user's message
+        if turn_count == 0:
+            prompt = build_system_prompt(str(getattr(messages[-1], "content", "")))
+            messages = [_system_message(prompt), *messages]
+
+        # Return cached response for an identical conversation
+        if use_cache:
+            cache_key = _response_cache_key(model, tools_hash, messages)
+            cached = _get_cached_response(cache_key)
+            if cached is not None:
+                return {"messages": [cached], "turn_count": turn_count + 1}
+
+        # Call LLM, streaming tokens so graph callers using
+        # stream_mode="messages" can render them as they arrive
+        response = None
+        async for chunk in llm_with_tools.astream(messages):
+            response = chunk if response is None else response + chunk
+        response = message_chunk_to_message(response)
 
-        # Call LLM
-        response = llm_with_tools.invoke(messages)
+        if use_cache:
+            _store_cached_response(cache_key, response, settings.llm_cache_size)
 
-        return {"messages": [response]}
+        return {"messages": [response], "turn_count": turn_count + 1}
 
     return agent_node
 
@@ -65,12 +294,11 @@ def should_continue(state: AgentState) -> Literal["tools", "end"]:
     Returns:
         "tools" if agent wants to call tools, "end" otherwise
     """
-    messages = state["messages"]
-    last_message = messages[-1]
+    last_message = state["messages"][-1]
 
     # If the last message has tool calls, route to tools
-    if isinstance(last_message, AIMessage) and last_message.tool_calls:
-        return "tools"
+    if isinstance(last_message, AIMessage):
+        return "tools" if last_message.tool_calls else "end"
 
     # Otherwise, end the conversation
     return "end"
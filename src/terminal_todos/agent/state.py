@@ -1,15 +1,43 @@
 """Agent state definition for LangGraph."""
 
-from typing import Annotated, Sequence
+from typing import Annotated, List, Sequence
 
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, ToolMessage
 from typing_extensions import TypedDict
 
 from langgraph.graph.message import add_messages
 
+from terminal_todos.config import get_settings
+
+
+def add_messages_bounded(left, right) -> List[BaseMessage]:
+    """
+    Merge messages like add_messages, keeping only the most recent ones.
+
+    The history is capped at settings.max_history_messages. After trimming,
+    leading tool results are dropped too, since a ToolMessage without the
+    AIMessage that requested it is rejected by the OpenAI API.
+    """
+    merged = add_messages(left, right)
+
+    max_messages = get_settings().max_history_messages
+    if len(merged) <= max_messages:
+        return merged
+
+    trimmed = merged[-max_messages:]
+    start = 0
+    while start < len(trimmed) and isinstance(trimmed[start], ToolMessage):
+        start += 1
+
+    return trimmed[start:]
+
 
 class AgentState(TypedDict):
     """State for the todo agent."""
 
-    # Conversation messages (automatically handles message accumulation)
-    messages: Annotated[Sequence[BaseMessage], add_messages]
+    # Conversation messages (accumulated and capped to the most recent ones)
+    messages: Annotated[Sequence[BaseMessage], add_messages_bounded]
+
+    # Number of agent (LLM) calls since the latest user message; 0 means the
+    # next call starts a new user turn
+    turn_count: int
@@ -0,0 +1,45 @@
+"""Token counting for agent prompts."""
+
+from functools import lru_cache
+
+from terminal_todos.agent.prompts import build_system_prompt
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Get the tiktoken encoding for a model (loaded once per model)."""
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model name - fall back to the encoding used by gpt-4o
+        return tiktoken.get_encoding("o200k_base")
+
+
+@lru_cache(maxsize=64)
+def count_prompt_tokens(prompt: str, model: str) -> int:
+    """
+    Count the tokens in a prompt for a model.
+
+    Prompts are built from a small set of cached strings, so results are
+    memoized and each compiled prompt is only encoded once per model.
+    """
+    return len(_get_encoding(model).encode(prompt))
+
+
+def system_prompt_tokens(model: str, message: str = "") -> int:
+    """
+    Get the token count of the system prompt sent for a user message.
+
+    Use this to budget a request before sending it, without re-encoding
+    the system prompt each time.
+
+    Args:
+        model: Model name used for tokenization
+        message: User message (selects the prompt sections)
+
+    Returns:
+        Number of tokens in the system prompt
+    """
+    return count_prompt_tokens(build_system_prompt(message), model)
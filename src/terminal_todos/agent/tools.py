@@ -1,19 +1,26 @@
 """LangGraph tools for the agent."""
 
-from datetime import datetime
-from typing import List, Optional
-
+import atexit
+import io
+import re
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from pydantic import BaseModel, Field
 
-try:
-    import dateparser
-    HAS_DATEPARSER = True
-except ImportError:
-    HAS_DATEPARSER = False
-
+from terminal_todos.config import get_settings
+from terminal_todos.core.email_service import EmailService
 from terminal_todos.core.note_service import NoteService
 from terminal_todos.core.todo_service import TodoService
+from terminal_todos.utils.logger import log_debug
+from terminal_todos.vector.cache import get_search_cache
+from terminal_todos.vector.embeddings import embed_text
 
 
 # Pydantic schemas for structured output
@@ -28,6 +35,12 @@ class EmailDraft(BaseModel):
     )
 
 
+# Priority display labels, shared by every tool that formats todos
+_PRIORITY_LABELS = {0: "", 1: " [HIGH]", 2: " [URGENT]"}
+_PRIORITY_NAMES = {0: "normal", 1: "high", 2: "urgent"}
+_PRIORITY_MARKS = {0: "", 1: " ❗", 2: " ❗❗"}
+
+
 # Global service instances (will be initialized in graph)
 _todo_service: Optional[TodoService] = None
 _note_service: Optional[NoteService] = None
@@ -40,24 +53,215 @@ def init_tools(todo_service: TodoService, note_service: NoteService):
     _note_service = note_service
 
 
+# Per-thread service instances. Tools run on executor threads, so each thread
+# keeps its own services (and database sessions) and reuses them across calls.
+_thread_services = threading.local()
+_all_thread_services: List[object] = []
+_thread_services_lock = threading.Lock()
+
+
+def _get_thread_service(name: str, factory):
+    """Get this thread's service instance, creating it on first use."""
+    service = getattr(_thread_services, name, None)
+    if service is None:
+        service = factory()
+        setattr(_thread_services, name, service)
+        with _thread_services_lock:
+            _all_thread_services.append(service)
+    else:
+        # Discard any failed transaction and stale objects from the previous call
+        sessions = [service.session]
+        if hasattr(service, "sync_service"):
+            sessions.append(service.sync_service.session)
+        for session in sessions:
+            session.rollback()
+            session.expire_all()
+    return service
+
+
 def get_todo_service() -> TodoService:
     """
     Get the todo service instance.
 
-    Creates a new instance each time to avoid thread-safety issues with database sessions.
+    Each thread gets its own instance, reused across tool calls on that thread
+    to avoid thread-safety issues with database sessions.
     """
-    # Always create fresh instance to avoid file descriptor issues across threads
-    return TodoService()
+    return _get_thread_service("todo_service", TodoService)
 
 
 def get_note_service() -> NoteService:
     """
     Get the note service instance.
 
-    Creates a new instance each time to avoid thread-safety issues with database sessions.
+    Each thread gets its own instance, reused across tool calls on that thread
+    to avoid thread-safety issues with database sessions.
+    """
+    return _get_thread_service("note_service", NoteService)
+
+
+def get_email_service() -> EmailService:
+    """
+    Get the email service instance.
+
+    Each thread gets its own instance, reused across tool calls on that thread
+    to avoid thread-safety issues with database sessions.
     """
-    # Always create fresh instance to avoid file descriptor issues across threads
-    return NoteService()
+    return _get_thread_service("email_service", EmailService)
+
+
+@atexit.register
+def close_tool_services() -> None:
+    """Close every per-thread service instance."""
+    with _thread_services_lock:
+        services = list(_all_thread_services)
+        _all_thread_services.clear()
+    for service in services:
+        try:
+            service.close()
+        except Exception as e:
+            log_debug("Failed to close tool service", {"service": type(service).__name__, "error": str(e)})
+
+
+@lru_cache(maxsize=1)
+def _get_dateparser():
+    """
+    Import dateparser on first use, or None if it isn't installed.
+
+    dateparser is slow to import (locale data, regex, pytz) and most tool
+    calls never parse a date, so it is loaded lazily.
+    """
+    try:
+        import dateparser
+    except ImportError:
+        return None
+    return dateparser
+
+
+@lru_cache(maxsize=4)
+def _get_date_data_parser(prefer: Optional[str] = None):
+    """
+    Get a reusable English-only dateparser parser, or None if dateparser isn't installed.
+
+    Restricting to English skips language detection across every locale,
+    the main cost of dateparser.parse().
+    """
+    dateparser = _get_dateparser()
+    if dateparser is None:
+        return None
+    settings = {'PREFER_DATES_FROM': prefer} if prefer else None
+    return dateparser.date.DateDataParser(languages=["en"], settings=settings)
+
+
+# YYYY-MM-DD, optionally followed by a time part
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(T.*)?$")
+
+
+# Weekday names to date.weekday() numbers
+_WEEKDAY_MAP = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+# Relative date phrases understood by the date tools. One pass over the
+# phrase; the name of the matching group is the bucket.
+_DATE_BUCKET_RE = re.compile(
+    r"(?P<rest_of_week>rest of (?:the )?week)"
+    r"|(?P<this_week>this week)"
+    r"|(?P<next_week>next week)"
+    r"|(?P<last_week>last week)"
+    r"|(?P<tomorrow>tomorrow)"
+    r"|(?P<yesterday>yesterday)"
+    r"|(?P<today>today)"
+    r"|(?P<this_month>this month)"
+    r"|(?P<last_month>last month)"
+    r"|(?P<next_month>next month)"
+    r"|(?P<month>month)"
+)
+
+
+def _date_bucket(text: str) -> Optional[str]:
+    """Classify a lowercased date phrase ("this_week", "tomorrow", ...), or None."""
+    match = _DATE_BUCKET_RE.search(text)
+    return match.lastgroup if match else None
+
+
+def _find_weekday(text: str) -> Optional[int]:
+    """Get the weekday number of the first weekday name in lowercased text, if any."""
+    return next((_WEEKDAY_MAP[word] for word in _WORD_RE.findall(text) if word in _WEEKDAY_MAP), None)
+
+
+_MONTH_ABBR = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _format_month_day(value: date) -> str:
+    """Format as "Jan 05" (same as strftime('%b %d'), without the libc call per row)."""
+    return f"{_MONTH_ABBR[value.month]} {value.day:02d}"
+
+
+def _format_clock(value: datetime) -> str:
+    """Format as "03:07 PM" (same as strftime('%I:%M %p'), without the libc call per row)."""
+    return f"{(value.hour - 1) % 12 + 1:02d}:{value.minute:02d} {'PM' if value.hour >= 12 else 'AM'}"
+
+
+def _as_date(value) -> date:
+    """Get the date part of a date or datetime."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _parse_date(date_str: str, prefer: Optional[str] = None) -> Optional[datetime]:
+    """
+    Parse an ISO or natural-language date.
+
+    ISO dates (the usual agent output) are parsed directly; dateparser is
+    only used for everything else.
+
+    Args:
+        date_str: Date string to parse
+        prefer: dateparser's PREFER_DATES_FROM ("future" or "past"), if any
+
+    Returns:
+        Parsed datetime, or None if the string can't be parsed
+    """
+    if _ISO_DATE_RE.match(date_str):
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+
+    parser = _get_date_data_parser(prefer)
+    if parser is not None:
+        try:
+            parsed = parser.get_date_data(date_str).date_obj
+            if parsed:
+                return parsed
+        except:
+            pass
+
+    try:
+        # Last resort: other formats fromisoformat accepts
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=512)
+def _parse_due(date_str: str, today_ordinal: int) -> Optional[datetime]:
+    """
+    Parse a due date (natural language or ISO format) to midnight.
+
+    Cached because users repeat the same phrases ("tomorrow", "friday").
+    today_ordinal is part of the cache key so relative phrases are
+    re-parsed once the day changes.
+    """
+    parsed = _parse_date(date_str, prefer="future")
+    if not parsed:
+        return None
+
+    # Normalize to midnight for consistency
+    return datetime(parsed.year, parsed.month, parsed.day, 0, 0, 0)
 
 
 @tool
@@ -83,39 +287,13 @@ def create_todo(content: str, priority: int = 0, due_date: Optional[str] = None)
     """
     service = get_todo_service()
 
-    try:
-        # Parse due date if provided
-        parsed_due_date = None
-        if due_date:
-            if HAS_DATEPARSER:
-                try:
-                    # Try dateparser for natural language with future preference
-                    parsed_due_date = dateparser.parse(due_date, settings={'PREFER_DATES_FROM': 'future'})
-                except:
-                    pass
+    # Parse due date if provided
+    parsed_due_date = _parse_due(due_date, date.today().toordinal()) if due_date else None
 
-            if not parsed_due_date:
-                try:
-                    # Try ISO format
-                    parsed_due_date = datetime.fromisoformat(due_date)
-                except:
-                    pass
-
-            # Normalize to midnight for consistency
-            if parsed_due_date:
-                parsed_due_date = datetime(parsed_due_date.year, parsed_due_date.month, parsed_due_date.day, 0, 0, 0)
-
-        todo = service.create_todo(content=content, priority=priority, due_date=parsed_due_date)
-
-        priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}
-        due_label = f" due {parsed_due_date.strftime('%Y-%m-%d')}" if parsed_due_date else ""
-        return f"✓ Created todo #{todo.id}: {content}{priority_label.get(priority, '')}{due_label}"
-    finally:
-        # Clean up service to close database connections
-        try:
-            service.close()
-        except:
-            pass
+    todo = service.create_todo(content=content, priority=priority, due_date=parsed_due_date)
+
+    due_label = f" due {parsed_due_date.strftime('%Y-%m-%d')}" if parsed_due_date else ""
+    return f"✓ Created todo #{todo.id}: {content}{_PRIORITY_LABELS.get(priority, '')}{due_label}"
 
 
 @tool
@@ -144,13 +322,13 @@ def list_todos(status: str = "active") -> str:
     if not todos:
         return f"No {status} todos found."
 
-    lines = [f"{title} ({len(todos)}):"]
+    buf = io.StringIO()
+    buf.write(f"{title} ({len(todos)}):")
     for todo in todos:
         status_icon = "✓" if todo.completed else "○"
-        priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(todo.priority, "")
-        lines.append(f"{status_icon} #{todo.id}: {todo.content}{priority_label}")
+        buf.write(f"\n{status_icon} #{todo.id}: {todo.content}{_PRIORITY_LABELS.get(todo.priority, '')}")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 @tool
@@ -200,18 +378,12 @@ def complete_todo(todo_id: int) -> str:
     """
     service = get_todo_service()
 
-    try:
-        todo = service.complete_todo(todo_id)
+    todo = service.complete_todo(todo_id)
 
-        if not todo:
-            return f"❌ Todo #{todo_id} not found"
+    if not todo:
+        return f"❌ Todo #{todo_id} not found"
 
-        return f"✓ Marked todo #{todo_id} as complete: {todo.content}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
+    return f"✓ Marked todo #{todo_id} as complete: {todo.content}"
 
 
 @tool
@@ -264,51 +436,39 @@ def update_todo(
         if not todo:
             return f"❌ Todo #{todo_id} not found"
 
+        # Parse the due date before touching the todo so a bad date
+        # doesn't leave a partial update behind
+        parsed_due_date = None
+        if due_date is not None:
+            parsed_due_date = _parse_due(due_date, date.today().toordinal())
+            if not parsed_due_date:
+                return f"❌ Could not parse due date '{due_date}'. Try ISO format (YYYY-MM-DD) or natural language like 'friday' or 'next week'."
+
         updates = []
 
         # Update content
         if content is not None:
             todo.content = content
-            service.session.commit()
             updates.append(f"content to '{content}'")
 
         # Update priority
         if priority is not None:
             todo.priority = priority
-            service.session.commit()
-            priority_label = {0: "normal", 1: "high", 2: "urgent"}.get(priority, "normal")
+            priority_label = _PRIORITY_NAMES.get(priority, "normal")
             updates.append(f"priority to {priority_label}")
 
         # Update due date
-        if due_date is not None:
-            parsed_due_date = None
-
-            if HAS_DATEPARSER:
-                try:
-                    # Try dateparser for natural language with future preference
-                    parsed_due_date = dateparser.parse(due_date, settings={'PREFER_DATES_FROM': 'future'})
-                except:
-                    pass
-
-            if not parsed_due_date:
-                try:
-                    # Try ISO format
-                    parsed_due_date = datetime.fromisoformat(due_date)
-                except:
-                    pass
-
-            if parsed_due_date:
-                # Normalize to midnight for consistency
-                parsed_due_date = datetime(parsed_due_date.year, parsed_due_date.month, parsed_due_date.day, 0, 0, 0)
-                todo.due_date = parsed_due_date
-                service.session.commit()
-                updates.append(f"due date to {parsed_due_date.strftime('%Y-%m-%d')}")
-            else:
-                return f"❌ Could not parse due date '{due_date}'. Try ISO format (YYYY-MM-DD) or natural language like 'friday' or 'next week'."
+        if parsed_due_date:
+            todo.due_date = parsed_due_date
+            updates.append(f"due date to {parsed_due_date.strftime('%Y-%m-%d')}")
 
         if updates:
-            # Sync to vector store
-            service.sync_service.sync_todo(todo_id)
+            # Commit all field changes in one transaction
+            service.session.commit()
+
+            # Sync to vector store (debounced, so back-to-back updates
+            # share one re-embedding)
+            service.sync_service.schedule_sync(todo_id)
 
             update_str = ", ".join(updates)
             return f"✓ Updated todo #{todo_id}: Changed {update_str}"
@@ -321,12 +481,6 @@ def update_todo(
         except:
             pass
         return f"❌ Failed to update todo #{todo_id}: {str(e)}"
-    finally:
-        # Clean up service to close database connections
-        try:
-            service.close()
-        except:
-            pass
 
 
 @tool
@@ -342,41 +496,40 @@ def find_todos_to_update(description: str) -> str:
     """
     service = get_todo_service()
 
-    try:
-        results = service.search_todos(description, k=5, completed=None)
-
-        if not results:
-            return f"❌ I couldn't find any todos matching '{description}'. Would you like to list all your todos?"
-
-        if len(results) == 1:
-            # Single match - return the ID so agent can proceed with update
-            todo_id = results[0]["todo_id"]
-            content = results[0]["content"]
-            priority = results[0]["metadata"].get("priority", 0)
+    results = service.search_todos(description, k=5, completed=None)
 
-            # Get the full todo for more details
+    if not results:
+        return f"❌ I couldn't find any todos matching '{description}'. Would you like to list all your todos?"
+
+    if len(results) == 1:
+        # Single match - return the ID so agent can proceed with update
+        todo_id = results[0]["todo_id"]
+        content = results[0]["content"]
+        priority = results[0]["metadata"].get("priority", 0)
+
+        # Due date comes from the search metadata ("" = none). Entries synced
+        # before due dates were indexed don't have the key, so look those up.
+        due_iso = results[0]["metadata"].get("due_date")
+        if due_iso is None:
             todo = service.get_todo(todo_id)
-            due_info = ""
-            if todo and todo.due_date:
-                due_info = f", due {todo.due_date.strftime('%Y-%m-%d')}"
+            due_iso = todo.due_date.isoformat() if todo and todo.due_date else ""
 
-            priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(priority, "")
-            return f"Found todo #{todo_id}: {content}{priority_label}{due_info}"
-        else:
-            # Multiple matches - ask for clarification
-            lines = [f"I found {len(results)} todos matching '{description}':"]
-            for i, result in enumerate(results, 1):
-                todo_id = result["todo_id"]
-                content = result["content"]
-                relevance = result.get("relevance", 0)
-                lines.append(f"{i}. #{todo_id}: {content} (match: {relevance:.0%})")
-            lines.append("\nWhich one would you like to update? (say the number or specify by ID like '#5')")
-            return "\n".join(lines)
-    finally:
-        try:
-            service.close()
-        except:
-            pass
+        due_info = ""
+        if due_iso:
+            due_info = f", due {datetime.fromisoformat(due_iso).strftime('%Y-%m-%d')}"
+
+        priority_label = _PRIORITY_LABELS.get(priority, "")
+        return f"Found todo #{todo_id}: {content}{priority_label}{due_info}"
+    else:
+        # Multiple matches - ask for clarification
+        lines = [f"I found {len(results)} todos matching '{description}':"]
+        for i, result in enumerate(results, 1):
+            todo_id = result["todo_id"]
+            content = result["content"]
+            relevance = result.get("relevance", 0)
+            lines.append(f"{i}. #{todo_id}: {content} (match: {relevance:.0%})")
+        lines.append("\nWhich one would you like to update? (say the number or specify by ID like '#5')")
+        return "\n".join(lines)
 
 
 @tool
@@ -392,32 +545,26 @@ def find_todos_to_complete(description: str) -> str:
     """
     service = get_todo_service()
 
-    try:
-        results = service.search_todos(description, k=5, completed=False)
+    results = service.search_todos(description, k=5, completed=False)
 
-        if not results:
-            return f"I couldn't find any active todos matching '{description}'. Would you like to list all your active todos?"
+    if not results:
+        return f"I couldn't find any active todos matching '{description}'. Would you like to list all your active todos?"
 
-        if len(results) == 1:
-            # Single match - suggest completing it
-            todo_id = results[0]["todo_id"]
-            content = results[0]["content"]
-            return f"Found 1 todo: #{todo_id}: {content}. Should I mark this as complete?"
-        else:
-            # Multiple matches - ask for confirmation
-            lines = [f"I found {len(results)} todos matching '{description}':"]
-            for i, result in enumerate(results, 1):
-                todo_id = result["todo_id"]
-                content = result["content"]
-                relevance = result.get("relevance", 0)
-                lines.append(f"{i}. #{todo_id}: {content} (match: {relevance:.0%})")
-            lines.append("\nWhich one(s) did you complete? (say the number or 'all')")
-            return "\n".join(lines)
-    finally:
-        try:
-            service.close()
-        except:
-            pass
+    if len(results) == 1:
+        # Single match - suggest completing it
+        todo_id = results[0]["todo_id"]
+        content = results[0]["content"]
+        return f"Found 1 todo: #{todo_id}: {content}. Should I mark this as complete?"
+    else:
+        # Multiple matches - ask for confirmation
+        lines = [f"I found {len(results)} todos matching '{description}':"]
+        for i, result in enumerate(results, 1):
+            todo_id = result["todo_id"]
+            content = result["content"]
+            relevance = result.get("relevance", 0)
+            lines.append(f"{i}. #{todo_id}: {content} (match: {relevance:.0%})")
+        lines.append("\nWhich one(s) did you complete? (say the number or 'all')")
+        return "\n".join(lines)
 
 
 @tool
@@ -436,24 +583,12 @@ def delete_todo(todo_id: int) -> str:
     """
     service = get_todo_service()
 
-    try:
-        # Get todo info before deleting
-        todo = service.get_todo(todo_id)
-        if not todo:
-            return f"❌ Todo #{todo_id} not found"
+    # Delete and fetch the content in one statement
+    content = service.delete_todo_returning_content(todo_id)
+    if content is None:
+        return f"❌ Todo #{todo_id} not found"
 
-        content = todo.content
-        deleted = service.delete_todo(todo_id)
-
-        if deleted:
-            return f"✗ Deleted todo #{todo_id}: {content}"
-        else:
-            return f"❌ Failed to delete todo #{todo_id}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
+    return f"✗ Deleted todo #{todo_id}: {content}"
 
 
 @tool
@@ -482,63 +617,50 @@ def delete_todos_bulk(
     """
     service = get_todo_service()
 
-    try:
-        # Get todos based on filter
-        if filter_type == "no_due_date":
-            todos = service.list_no_due_date()
-            filter_desc = "todos without due dates"
-        elif filter_type == "completed":
-            todos = service.list_completed()
-            filter_desc = "completed todos"
-        elif filter_type == "overdue":
-            todos = service.list_overdue()
-            filter_desc = "overdue todos"
-        elif filter_type == "all_active":
-            todos = service.list_active()
-            filter_desc = "ALL active todos"
-        else:
-            return f"❌ Invalid filter type: {filter_type}. Use: no_due_date, completed, overdue, or all_active"
-
-        if not todos:
-            return f"No {filter_desc} found to delete."
-
-        # Preview mode - just show what would be deleted
-        if not confirm:
-            lines = [f"Found {len(todos)} {filter_desc} that would be deleted:"]
-            for i, todo in enumerate(todos[:10], 1):  # Show max 10
-                lines.append(f"{i}. #{todo.id}: {todo.content}")
-            if len(todos) > 10:
-                lines.append(f"... and {len(todos) - 10} more")
-            lines.append("")
-            lines.append("⚠️ To confirm deletion, user must explicitly agree to delete these todos.")
-            return "\n".join(lines)
-
-        # Confirmed deletion
-        deleted_count = 0
-        deleted_todos = []
+    # Get todos based on filter
+    if filter_type == "no_due_date":
+        todos = service.list_no_due_date()
+        filter_desc = "todos without due dates"
+    elif filter_type == "completed":
+        todos = service.list_completed()
+        filter_desc = "completed todos"
+    elif filter_type == "overdue":
+        todos = service.list_overdue()
+        filter_desc = "overdue todos"
+    elif filter_type == "all_active":
+        todos = service.list_active()
+        filter_desc = "ALL active todos"
+    else:
+        return f"❌ Invalid filter type: {filter_type}. Use: no_due_date, completed, overdue, or all_active"
 
-        for todo in todos:
-            content = todo.content
-            if service.delete_todo(todo.id):
-                deleted_count += 1
-                deleted_todos.append(f"#{todo.id}: {content}")
-
-        if deleted_count > 0:
-            result = f"✗ Successfully deleted {deleted_count} {filter_desc}:\n"
-            # Show first 5 deleted
-            for item in deleted_todos[:5]:
-                result += f"  - {item}\n"
-            if len(deleted_todos) > 5:
-                result += f"  ... and {len(deleted_todos) - 5} more"
-            return result
-        else:
-            return f"❌ Failed to delete any todos"
+    if not todos:
+        return f"No {filter_desc} found to delete."
+
+    # Preview mode - just show what would be deleted
+    if not confirm:
+        lines = [f"Found {len(todos)} {filter_desc} that would be deleted:"]
+        for i, todo in enumerate(todos[:10], 1):  # Show max 10
+            lines.append(f"{i}. #{todo.id}: {todo.content}")
+        if len(todos) > 10:
+            lines.append(f"... and {len(todos) - 10} more")
+        lines.append("")
+        lines.append("⚠️ To confirm deletion, user must explicitly agree to delete these todos.")
+        return "\n".join(lines)
 
-    finally:
-        try:
-            service.close()
-        except:
-            pass
+    # Confirmed deletion - capture contents first, then delete in one batch
+    deleted_todos = [f"#{todo.id}: {todo.content}" for todo in todos]
+    deleted_count = service.delete_todos_bulk([todo.id for todo in todos])
+
+    if deleted_count > 0:
+        result = f"✗ Successfully deleted {deleted_count} {filter_desc}:\n"
+        # Show first 5 deleted
+        for item in deleted_todos[:5]:
+            result += f"  - {item}\n"
+        if len(deleted_todos) > 5:
+            result += f"  ... and {len(deleted_todos) - 5} more"
+        return result
+    else:
+        return f"❌ Failed to delete any todos"
 
 
 @tool
@@ -554,27 +676,22 @@ def list_focused_todos() -> str:
     """
     service = get_todo_service()
 
-    try:
-        focused = service.list_focused()
+    focused = service.list_focused()
 
-        if not focused:
-            return "No todos in focus list. You can add todos with the add_to_focus tool."
+    if not focused:
+        return "No todos in focus list. You can add todos with the add_to_focus tool."
 
-        lines = [f"⭐ Focus List ({len(focused)} items):"]
-        for todo in focused:
-            priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(todo.priority, "")
+    lines = [f"⭐ Focus List ({len(focused)} items):"]
+    for todo in focused:
+        priority_label = _PRIORITY_LABELS.get(todo.priority, "")
 
-            due_label = ""
-            if todo.due_date:
-                from datetime import datetime
-                due_date = todo.due_date.date() if isinstance(todo.due_date, datetime) else todo.due_date
-                due_label = f" (due {due_date.strftime('%m/%d')})"
+        due_label = ""
+        if todo.due_date:
+            due_label = f" (due {_as_date(todo.due_date).strftime('%m/%d')})"
 
-            lines.append(f"○ #{todo.id}: {todo.content}{priority_label}{due_label}")
+        lines.append(f"○ #{todo.id}: {todo.content}{priority_label}{due_label}")
 
-        return "\n".join(lines)
-    finally:
-        service.close()
+    return "\n".join(lines)
 
 
 @tool
@@ -596,24 +713,21 @@ def add_to_focus(todo_id: int) -> str:
     """
     service = get_todo_service()
 
-    try:
-        # Check current count
-        count = service.get_focus_count()
-        if count >= 10:
-            warning = f"\n⚠️  Note: You now have {count + 1} focused todos. Consider keeping it to 5-10 for best focus."
-        elif count >= 5:
-            warning = ""
-        else:
-            warning = ""
+    # Check current count
+    count = service.get_focus_count()
+    if count >= 10:
+        warning = f"\n⚠️  Note: You now have {count + 1} focused todos. Consider keeping it to 5-10 for best focus."
+    elif count >= 5:
+        warning = ""
+    else:
+        warning = ""
 
-        todo = service.add_to_focus(todo_id)
+    todo = service.add_to_focus(todo_id)
 
-        if not todo:
-            return f"✗ Todo #{todo_id} not found"
+    if not todo:
+        return f"✗ Todo #{todo_id} not found"
 
-        return f"⭐ Added to focus: #{todo.id} {todo.content}{warning}"
-    finally:
-        service.close()
+    return f"⭐ Added to focus: #{todo.id} {todo.content}{warning}"
 
 
 @tool
@@ -631,15 +745,12 @@ def remove_from_focus(todo_id: int) -> str:
     """
     service = get_todo_service()
 
-    try:
-        todo = service.remove_from_focus(todo_id)
+    todo = service.remove_from_focus(todo_id)
 
-        if not todo:
-            return f"✗ Todo #{todo_id} not found"
+    if not todo:
+        return f"✗ Todo #{todo_id} not found"
 
-        return f"Removed from focus: #{todo.id} {todo.content}"
-    finally:
-        service.close()
+    return f"Removed from focus: #{todo.id} {todo.content}"
 
 
 @tool
@@ -655,11 +766,34 @@ def clear_focus_list() -> str:
     """
     service = get_todo_service()
 
-    try:
-        count = service.clear_focus()
-        return f"✓ Cleared {count} todo(s) from focus list"
-    finally:
-        service.close()
+    count = service.clear_focus()
+    return f"✓ Cleared {count} todo(s) from focus list"
+
+
+def _focus_reasons(due_in: int, priority: int, age_days: int) -> List[str]:
+    """Explain a focus suggestion's score (mirrors the scoring in suggest_focus_todos)."""
+    reasons = []
+
+    if due_in < 0:
+        reasons.append(f"{-due_in}d overdue")
+    elif due_in == 0:
+        reasons.append("due today")
+    elif due_in == 1:
+        reasons.append("due tomorrow")
+    elif due_in <= 3:
+        reasons.append("due within 3 days")
+    elif due_in <= 7:
+        reasons.append("due this week")
+
+    if priority >= 2:
+        reasons.append("urgent priority")
+    elif priority == 1:
+        reasons.append("high priority")
+
+    if age_days > 14:
+        reasons.append(f"{age_days}d old")
+
+    return reasons
 
 
 @tool
@@ -679,111 +813,69 @@ def suggest_focus_todos() -> str:
     Returns:
         Formatted list with numbered suggestions and special marker for interactive selection
     """
-    from datetime import datetime, date, timedelta
-
     service = get_todo_service()
 
-    try:
-        # Get all active todos that aren't already in focus
-        all_active = service.list_active(limit=1000)
-        focused = service.list_focused()
-        focused_ids = {t.id for t in focused}
-
-        # Filter to only non-focused todos
-        candidates = [t for t in all_active if t.id not in focused_ids]
-
-        if not candidates:
-            return "No todos available to suggest. All active todos are either already in focus or you have no active todos."
-
-        # Score each todo
-        today = date.today()
-        suggestions = []
-
-        for todo in candidates:
-            score = 0
-            reasons = []
-
-            # Due date scoring
-            if todo.due_date:
-                todo_date = todo.due_date.date() if isinstance(todo.due_date, datetime) else todo.due_date
-
-                if todo_date < today:
-                    days_overdue = (today - todo_date).days
-                    score += 100
-                    reasons.append(f"{days_overdue}d overdue")
-                elif todo_date == today:
-                    score += 80
-                    reasons.append("due today")
-                elif todo_date == today + timedelta(days=1):
-                    score += 60
-                    reasons.append("due tomorrow")
-                elif todo_date <= today + timedelta(days=3):
-                    score += 40
-                    reasons.append("due within 3 days")
-                elif todo_date <= today + timedelta(days=7):
-                    score += 20
-                    reasons.append("due this week")
-
-            # Priority scoring
-            if todo.priority >= 2:
-                score += 50
-                reasons.append("urgent priority")
-            elif todo.priority == 1:
-                score += 30
-                reasons.append("high priority")
-
-            # Age scoring (older todos might need attention)
-            age_days = (datetime.utcnow() - todo.created_at).days
-            if age_days > 30:
-                score += 25
-                reasons.append(f"{age_days}d old")
-            elif age_days > 14:
-                score += 15
-                reasons.append(f"{age_days}d old")
-            elif age_days > 7:
-                score += 5
-
-            suggestions.append({
-                'todo': todo,
-                'score': score,
-                'reasons': reasons
-            })
-
-        # Sort by score (highest first) and take top 10
-        suggestions.sort(key=lambda x: x['score'], reverse=True)
-        top_suggestions = suggestions[:10]
-
-        if not top_suggestions:
-            return "No strong suggestions found. Your todos look well-organized!"
-
-        # Format output
-        lines = [f"📊 Suggested todos for focus (top {len(top_suggestions)}):\n"]
-
-        for i, item in enumerate(top_suggestions, 1):
-            todo = item['todo']
-            reasons = item['reasons']
-            reason_str = ", ".join(reasons) if reasons else "good candidate"
-
-            priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(todo.priority, "")
-            due_label = ""
-            if todo.due_date:
-                todo_date = todo.due_date.date() if isinstance(todo.due_date, datetime) else todo.due_date
-                due_label = f" (due {todo_date.strftime('%m/%d')})"
-
-            lines.append(f"{i}. #{todo.id}: {todo.content}{priority_label}{due_label}")
-            lines.append(f"   Why: {reason_str}")
-
-        lines.append("\n💡 Select todos to add to focus by typing their numbers (e.g., '1,2,3' or 'all')")
-
-        # Add special marker for interactive selection
-        todo_ids = [str(item['todo'].id) for item in top_suggestions]
-        result = "\n".join(lines)
-        result += f"\n__FOCUS_SUGGESTIONS__|{','.join(todo_ids)}__"
+    today = date.today()
+    now = datetime.utcnow()
 
-        return result
+    # Shortlist in SQL: the highest-scoring active, unfocused todos
+    # (due within a week or overdue, high/urgent priority, or over a week old)
+    candidates = service.list_focus_candidates(today, now)
+
+    if not candidates:
+        return "No strong suggestions found. None of your unfocused todos are due this week, high priority, or more than a week old."
+
+    # Score all candidates at once: one array per signal, bonuses via masks
+    n = len(candidates)
+
+    # Days until due (negative = overdue); NO_DUE for todos without a due date
+    NO_DUE = np.iinfo(np.int32).max
+    due_in = np.fromiter(
+        (
+            (_as_date(t.due_date) - today).days if t.due_date else NO_DUE
+            for t in candidates
+        ),
+        dtype=np.int32,
+        count=n,
+    )
+    priority = np.fromiter((t.priority for t in candidates), dtype=np.int32, count=n)
+    age_days = np.fromiter(((now - t.created_at).days for t in candidates), dtype=np.int32, count=n)
+
+    score = np.select(
+        [due_in < 0, due_in == 0, due_in == 1, due_in <= 3, due_in <= 7],
+        [100, 80, 60, 40, 20],
+        default=0,
+    )
+    score += np.select([priority >= 2, priority == 1], [50, 30], default=0)
+    score += np.select([age_days > 30, age_days > 14, age_days > 7], [25, 15, 5], default=0)
+
+    # Highest score first; stable so ties keep list order. Take top 10.
+    top = np.argsort(-score, kind="stable")[:10]
 
-    finally:
-        service.close()
+    # Format output (reasons are only built for the suggestions shown)
+    buf = io.StringIO()
+    buf.write(f"📊 Suggested todos for focus (top {top.size}):\n")
+
+    for i, idx in enumerate(top, 1):
+        todo = candidates[idx]
+        reasons = _focus_reasons(int(due_in[idx]), int(priority[idx]), int(age_days[idx]))
+        reason_str = ", ".join(reasons) if reasons else "good candidate"
+
+        priority_label = _PRIORITY_LABELS.get(todo.priority, "")
+        due_label = ""
+        if todo.due_date:
+            due_label = f" (due {_as_date(todo.due_date).strftime('%m/%d')})"
+
+        buf.write(f"\n{i}. #{todo.id}: {todo.content}{priority_label}{due_label}")
+        buf.write(f"\n   Why: {reason_str}")
+
+    buf.write("\n\n💡 Select todos to add to focus by typing their numbers (e.g., '1,2,3' or 'all')")
+
+    # Add special marker for interactive selection
+    todo_ids = ",".join(str(candidates[idx].id) for idx in top)
+    buf.write(f"\n__FOCUS_SUGGESTIONS__|{todo_ids}__")
+
+    return buf.getvalue()
 
 
 @tool
@@ -820,29 +912,29 @@ def list_notes(limit: int = 10) -> str:
         Formatted list of notes
     """
     service = get_note_service()
-    notes = service.list_all(limit=limit)
+    notes = service.list_previews(limit=limit, preview_len=150)
 
     if not notes:
         return "No notes found."
 
-    lines = [f"📋 Recent Notes ({len(notes)}):\n"]
+    buf = io.StringIO()
+    buf.write(f"📋 Recent Notes ({len(notes)}):\n")
     for note in notes:
         title_display = note.title or "Untitled"
-        preview = note.content[:150] + "..." if len(note.content) > 150 else note.content
-        lines.append(f"📝 Note #{note.id}: {title_display}")
+        preview = note.content_preview[:150] + ("..." if len(note.content_preview) > 150 else "")
+        buf.write(f"\n📝 Note #{note.id}: {title_display}")
 
         # Add category and tags if available
         if note.category:
-            lines.append(f"   Category: [{note.category.upper()}]")
+            buf.write(f"\n   Category: [{note.category.upper()}]")
 
-        tags = note.get_tags() if hasattr(note, 'get_tags') else []
+        tags = note.get_tags()
         if tags:
-            lines.append(f"   Tags: 🏷️  {', '.join(tags)}")
+            buf.write(f"\n   Tags: 🏷️  {', '.join(tags)}")
 
-        lines.append(f"   Preview: {preview}")
-        lines.append("")  # Blank line between notes
+        buf.write(f"\n   Preview: {preview}\n")  # Blank line between notes
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 @tool
@@ -874,7 +966,8 @@ def search_notes(query: str, limit: int = 10) -> str:
     if not results:
         return f"❌ No notes found matching: '{query}'\n\nTry:\n• Using different keywords\n• Broadening your search\n• Asking 'list notes' to see all notes"
 
-    lines = [f"🔍 Found {len(results)} note(s) matching '{query}':\n"]
+    buf = io.StringIO()
+    buf.write(f"🔍 Found {len(results)} note(s) matching '{query}':\n")
 
     for result in results:
         note_id = result["note_id"]
@@ -891,24 +984,23 @@ def search_notes(query: str, limit: int = 10) -> str:
         preview = content[:150] + "..." if len(content) > 150 else content
 
         # Build formatted entry - Use actual note ID prominently
-        lines.append(f"📝 Note #{note_id}: {title}")
+        buf.write(f"\n📝 Note #{note_id}: {title}")
 
         if category:
-            lines.append(f"   Category: [{category.upper()}]")
+            buf.write(f"\n   Category: [{category.upper()}]")
 
         if tags:
-            lines.append(f"   Tags: 🏷️  {tags}")
+            buf.write(f"\n   Tags: 🏷️  {tags}")
 
         if keywords:
-            lines.append(f"   Keywords: {keywords}")
+            buf.write(f"\n   Keywords: {keywords}")
 
-        lines.append(f"   Preview: {preview}")
-        lines.append("")  # Blank line between notes
+        buf.write(f"\n   Preview: {preview}\n")  # Blank line between notes
 
-    lines.append(f"💡 To see full content of a note, use: get_note(note_id)")
-    lines.append(f"💡 To analyze these notes in detail, use: get_notes_for_analysis(\"{query}\")")
+    buf.write("\n💡 To see full content of a note, use: get_note(note_id)")
+    buf.write(f"\n💡 To analyze these notes in detail, use: get_notes_for_analysis(\"{query}\")")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 @tool
@@ -980,8 +1072,6 @@ def get_current_date() -> str:
     Returns:
         Current date and time with day of week
     """
-    from datetime import datetime
-
     now = datetime.now()
 
     # Return comprehensive date info
@@ -1011,6 +1101,100 @@ def get_todo_stats() -> str:
 • Total: {counts['total']}"""
 
 
+@lru_cache(maxsize=256)
+def _due_date_range(date_string: str, today_date: date) -> Optional[Tuple[datetime, datetime, str]]:
+    """
+    Resolve a date phrase to the [start, end) range of due dates it covers.
+
+    Relative phrases look forward ("friday" is the next Friday). Cached per
+    phrase and day, so repeated phrases skip the parsing entirely.
+
+    Returns:
+        (start, end, label), or None if the phrase can't be parsed
+    """
+    today = datetime.combine(today_date, datetime.min.time())
+    date_lower = date_string.lower()
+    bucket = _date_bucket(date_lower)
+    target_day = _find_weekday(date_lower)
+
+    # Handle special cases first
+    if bucket == "rest_of_week":
+        # From today to Sunday
+        start_date = today
+        days_until_sunday = (6 - today.weekday()) % 7
+        if days_until_sunday == 0:  # If today is Sunday, go to next Sunday
+            days_until_sunday = 7
+        end_date = today + timedelta(days=days_until_sunday + 1)  # +1 to include Sunday
+        date_label = f"rest of this week ({today.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
+
+    elif bucket == "this_week":
+        # Monday to Sunday of current week
+        days_since_monday = today.weekday()
+        start_date = today - timedelta(days=days_since_monday)
+        end_date = start_date + timedelta(days=7)
+        date_label = f"this week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
+
+    elif bucket == "next_week":
+        # Next Monday to Sunday
+        days_until_monday = (7 - today.weekday()) % 7
+        if days_until_monday == 0:
+            days_until_monday = 7
+        start_date = today + timedelta(days=days_until_monday)
+        end_date = start_date + timedelta(days=7)
+        date_label = f"next week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
+
+    elif target_day is not None:
+        # Specific day of week - find next occurrence
+        days_ahead = target_day - today.weekday()
+        if days_ahead <= 0:  # Target day already happened this week
+            days_ahead += 7
+
+        parsed_date = today + timedelta(days=days_ahead)
+        start_date = parsed_date
+        end_date = parsed_date + timedelta(days=1)
+        date_label = parsed_date.strftime('%A, %B %d, %Y')
+
+    elif bucket == "tomorrow":
+        start_date = today + timedelta(days=1)
+        end_date = start_date + timedelta(days=1)
+        date_label = start_date.strftime('%A, %B %d, %Y')
+
+    elif bucket == "today":
+        start_date = today
+        end_date = today + timedelta(days=1)
+        date_label = today.strftime('%A, %B %d, %Y')
+
+    elif bucket in ("this_month", "last_month", "next_month", "month"):
+        if bucket == "next_month":
+            # Next month
+            if today.month == 12:
+                start_date = datetime(today.year + 1, 1, 1)
+            else:
+                start_date = datetime(today.year, today.month + 1, 1)
+        else:
+            # This month
+            start_date = datetime(today.year, today.month, 1)
+
+        # First day of the following month (exclusive end)
+        if start_date.month == 12:
+            end_date = datetime(start_date.year + 1, 1, 1)
+        else:
+            end_date = datetime(start_date.year, start_date.month + 1, 1)
+        date_label = start_date.strftime('%B %Y')
+
+    else:
+        # Try ISO format or dateparser
+        parsed_date = _parse_date(date_string, prefer="future")
+        if parsed_date is None:
+            return None
+
+        start_date = datetime(parsed_date.year, parsed_date.month, parsed_date.day, 0, 0, 0)
+        end_date = start_date + timedelta(days=1)
+        date_label = parsed_date.strftime('%A, %B %d, %Y')
+
+    return start_date, end_date, date_label
+
+
 @tool
 def list_todos_by_date(date_string: str, include_completed: bool = False) -> str:
     """
@@ -1032,107 +1216,10 @@ def list_todos_by_date(date_string: str, include_completed: bool = False) -> str
     service = get_todo_service()
 
     try:
-        from datetime import datetime, timedelta
-
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        date_lower = date_string.lower()
-
-        # Handle special cases first
-        if "rest of the week" in date_lower or "rest of week" in date_lower:
-            # From today to Sunday
-            start_date = today
-            days_until_sunday = (6 - today.weekday()) % 7
-            if days_until_sunday == 0:  # If today is Sunday, go to next Sunday
-                days_until_sunday = 7
-            end_date = today + timedelta(days=days_until_sunday + 1)  # +1 to include Sunday
-            date_label = f"rest of this week ({today.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
-
-        elif "this week" in date_lower:
-            # Monday to Sunday of current week
-            days_since_monday = today.weekday()
-            start_date = today - timedelta(days=days_since_monday)
-            end_date = start_date + timedelta(days=7)
-            date_label = f"this week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
-
-        elif "next week" in date_lower:
-            # Next Monday to Sunday
-            days_until_monday = (7 - today.weekday()) % 7
-            if days_until_monday == 0:
-                days_until_monday = 7
-            start_date = today + timedelta(days=days_until_monday)
-            end_date = start_date + timedelta(days=7)
-            date_label = f"next week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
-
-        elif any(day in date_lower for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]):
-            # Specific day of week - find next occurrence
-            target_days = {
-                "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-                "friday": 4, "saturday": 5, "sunday": 6
-            }
-
-            target_day = None
-            for day_name, day_num in target_days.items():
-                if day_name in date_lower:
-                    target_day = day_num
-                    break
-
-            if target_day is not None:
-                days_ahead = target_day - today.weekday()
-                if days_ahead <= 0:  # Target day already happened this week
-                    days_ahead += 7
-
-                parsed_date = today + timedelta(days=days_ahead)
-                start_date = parsed_date
-                end_date = parsed_date + timedelta(days=1)
-                date_label = parsed_date.strftime('%A, %B %d, %Y')
-            else:
-                return f"❌ Could not determine which day of the week from '{date_string}'"
-
-        elif "tomorrow" in date_lower:
-            start_date = today + timedelta(days=1)
-            end_date = start_date + timedelta(days=1)
-            date_label = start_date.strftime('%A, %B %d, %Y')
-
-        elif "today" in date_lower:
-            start_date = today
-            end_date = today + timedelta(days=1)
-            date_label = today.strftime('%A, %B %d, %Y')
-
-        elif "month" in date_lower:
-            if "next" in date_lower:
-                # Next month
-                if today.month == 12:
-                    start_date = datetime(today.year + 1, 1, 1)
-                else:
-                    start_date = datetime(today.year, today.month + 1, 1)
-            else:
-                # This month
-                start_date = datetime(today.year, today.month, 1)
-
-            # Get last day of month
-            next_month = start_date.replace(day=28) + timedelta(days=4)
-            end_date = next_month - timedelta(days=next_month.day - 1) + timedelta(days=1)
-            date_label = start_date.strftime('%B %Y')
-
-        else:
-            # Try dateparser or ISO format
-            parsed_date = None
-
-            if HAS_DATEPARSER:
-                try:
-                    parsed_date = dateparser.parse(date_string, settings={'PREFER_DATES_FROM': 'future'})
-                except:
-                    pass
-
-            if not parsed_date:
-                try:
-                    parsed_date = datetime.fromisoformat(date_string)
-                except:
-                    return f"❌ Could not parse date '{date_string}'. Try formats like 'this friday', 'tomorrow', 'rest of the week', or ISO format (YYYY-MM-DD)."
-
-            start_date = datetime(parsed_date.year, parsed_date.month, parsed_date.day, 0, 0, 0)
-            end_date = start_date + timedelta(days=1)
-            date_label = parsed_date.strftime('%A, %B %d, %Y')
+        date_range = _due_date_range(date_string, date.today())
+        if date_range is None:
+            return f"❌ Could not parse date '{date_string}'. Try formats like 'this friday', 'tomorrow', 'rest of the week', or ISO format (YYYY-MM-DD)."
+        start_date, end_date, date_label = date_range
 
         todos = service.list_by_date_range(start_date, end_date, include_completed)
 
@@ -1145,19 +1232,76 @@ def list_todos_by_date(date_string: str, include_completed: bool = False) -> str
 
         for todo in todos:
             status_icon = "✓" if todo.completed else "○"
-            priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(todo.priority, "")
-            due_display = todo.due_date.strftime('%b %d') if todo.due_date else ""
-            lines.append(f"{status_icon} #{todo.id}: {todo.content}{priority_label} ({due_display})")
+            priority_label = _PRIORITY_LABELS.get(todo.priority, "")
+            due_display = _format_month_day(todo.due_date) if todo.due_date else ""
+            lines.append(f"\n{status_icon} #{todo.id}: {todo.content}{priority_label} ({due_display})")
 
-        return "\n".join(lines)
+        return "".join(lines)
 
     except Exception as e:
         return f"❌ Error listing todos by date: {str(e)}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
+
+
+@lru_cache(maxsize=256)
+def _completed_date_range(date_string: str, today_date: date) -> Optional[Tuple[datetime, datetime, str]]:
+    """
+    Resolve a date phrase to the [start, end) range of completion times it covers.
+
+    Cached per phrase and day, so repeated phrases skip the parsing entirely.
+
+    Returns:
+        (start, end, label), or None if the phrase can't be parsed
+    """
+    today = datetime.combine(today_date, datetime.min.time())
+    date_lower = date_string.lower()
+    bucket = _date_bucket(date_lower)
+
+    # Handle special cases
+    if bucket == "rest_of_week":
+        # From today to Sunday
+        start_date = today
+        days_until_sunday = (6 - today.weekday()) % 7
+        if days_until_sunday == 0:
+            days_until_sunday = 7
+        end_date = today + timedelta(days=days_until_sunday + 1)
+        date_label = f"rest of this week"
+
+    elif bucket == "this_week":
+        # Monday to Sunday of current week
+        days_since_monday = today.weekday()
+        start_date = today - timedelta(days=days_since_monday)
+        end_date = start_date + timedelta(days=7)
+        date_label = f"this week"
+
+    elif bucket == "last_week":
+        # Previous Monday to Sunday
+        days_since_monday = today.weekday()
+        this_monday = today - timedelta(days=days_since_monday)
+        start_date = this_monday - timedelta(days=7)
+        end_date = this_monday
+        date_label = f"last week"
+
+    elif bucket == "yesterday":
+        start_date = today - timedelta(days=1)
+        end_date = today
+        date_label = "yesterday"
+
+    elif bucket == "today":
+        start_date = today
+        end_date = today + timedelta(days=1)
+        date_label = "today"
+
+    else:
+        # Try parsing as ISO format or with dateparser
+        parsed_date = _parse_date(date_string)
+        if parsed_date is None:
+            return None
+
+        start_date = datetime(parsed_date.year, parsed_date.month, parsed_date.day, 0, 0, 0)
+        end_date = start_date + timedelta(days=1)
+        date_label = parsed_date.strftime('%A, %B %d, %Y')
+
+    return start_date, end_date, date_label
 
 
 @tool
@@ -1181,65 +1325,10 @@ def list_completed_by_date(date_string: str = "today", limit: int = 100) -> str:
     service = get_todo_service()
 
     try:
-        from datetime import datetime, timedelta
-        import dateparser
-
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        date_lower = date_string.lower()
-
-        # Handle special cases
-        if "rest of the week" in date_lower or "rest of week" in date_lower:
-            # From today to Sunday
-            start_date = today
-            days_until_sunday = (6 - today.weekday()) % 7
-            if days_until_sunday == 0:
-                days_until_sunday = 7
-            end_date = today + timedelta(days=days_until_sunday + 1)
-            date_label = f"rest of this week"
-
-        elif "this week" in date_lower:
-            # Monday to Sunday of current week
-            days_since_monday = today.weekday()
-            start_date = today - timedelta(days=days_since_monday)
-            end_date = start_date + timedelta(days=7)
-            date_label = f"this week"
-
-        elif "last week" in date_lower:
-            # Previous Monday to Sunday
-            days_since_monday = today.weekday()
-            this_monday = today - timedelta(days=days_since_monday)
-            start_date = this_monday - timedelta(days=7)
-            end_date = this_monday
-            date_label = f"last week"
-
-        elif "yesterday" in date_lower:
-            start_date = today - timedelta(days=1)
-            end_date = today
-            date_label = "yesterday"
-
-        elif "today" in date_lower:
-            start_date = today
-            end_date = today + timedelta(days=1)
-            date_label = "today"
-
-        else:
-            # Try parsing with dateparser or ISO format
-            parsed_date = None
-
-            try:
-                parsed_date = dateparser.parse(date_string)
-            except:
-                pass
-
-            if not parsed_date:
-                try:
-                    parsed_date = datetime.fromisoformat(date_string)
-                except:
-                    return f"❌ Could not parse date '{date_string}'. Try formats like 'today', 'yesterday', 'this week', or ISO format (YYYY-MM-DD)."
-
-            start_date = datetime(parsed_date.year, parsed_date.month, parsed_date.day, 0, 0, 0)
-            end_date = start_date + timedelta(days=1)
-            date_label = parsed_date.strftime('%A, %B %d, %Y')
+        date_range = _completed_date_range(date_string, date.today())
+        if date_range is None:
+            return f"❌ Could not parse date '{date_string}'. Try formats like 'today', 'yesterday', 'this week', or ISO format (YYYY-MM-DD)."
+        start_date, end_date, date_label = date_range
 
         # Query completed todos by completion date
         todos = service.list_completed_by_date_range(start_date, end_date, limit=limit)
@@ -1250,24 +1339,16 @@ def list_completed_by_date(date_string: str = "today", limit: int = 100) -> str:
         lines = [f"✅ You completed {len(todos)} todo(s) {date_label}:\n"]
 
         for todo in todos:
-            priority_label = {0: "", 1: " ❗", 2: " ❗❗"}.get(todo.priority, "")
+            priority_label = _PRIORITY_MARKS.get(todo.priority, "")
 
             # Show completion time
-            if todo.completed_at:
-                completed_time = todo.completed_at.strftime('%I:%M %p')
-                lines.append(f"✓ #{todo.id}: {todo.content}{priority_label} (completed at {completed_time})")
-            else:
-                lines.append(f"✓ #{todo.id}: {todo.content}{priority_label}")
+            completed_time = f" (completed at {_format_clock(todo.completed_at)})" if todo.completed_at else ""
+            lines.append(f"\n✓ #{todo.id}: {todo.content}{priority_label}{completed_time}")
 
-        return "\n".join(lines)
+        return "".join(lines)
 
     except Exception as e:
         return f"❌ Error listing completed todos: {str(e)}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
 
 
 @tool
@@ -1287,8 +1368,6 @@ def import_notes_bulk(content: str, auto_split: bool = True) -> str:
     """
     from terminal_todos.extraction.knowledge_extractor import KnowledgeExtractor
 
-    service = get_note_service()
-
     try:
         extractor = KnowledgeExtractor()
 
@@ -1316,11 +1395,6 @@ def import_notes_bulk(content: str, auto_split: bool = True) -> str:
 
     except Exception as e:
         return f"❌ Failed to extract notes: {str(e)}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
 
 
 @tool
@@ -1362,11 +1436,6 @@ def search_notes_by_category(category: str, limit: int = 10) -> str:
 
     except Exception as e:
         return f"❌ Search failed: {str(e)}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
 
 
 @tool
@@ -1400,41 +1469,35 @@ def get_notes_for_analysis(query: str, limit: int = 5) -> str:
     if not results:
         return f"❌ No notes found matching: '{query}'"
 
-    lines = [f"📚 Retrieved {len(results)} note(s) for analysis:\n"]
-    lines.append("=" * 80 + "\n")
+    rule = "=" * 80
+    lines = [f"📚 Retrieved {len(results)} note(s) for analysis:\n\n{rule}\n"]
+
+    # Get full notes from database in one query
+    notes_by_id = {note.id: note for note in service.get_notes_bulk([r["note_id"] for r in results])}
 
     for i, result in enumerate(results, 1):
         note_id = result["note_id"]
 
-        # Get full note from database
-        note = service.get_note(note_id)
+        note = notes_by_id.get(note_id)
         if not note:
             continue
 
         title = note.title or "Untitled"
         created = note.created_at.strftime("%Y-%m-%d %H:%M")
-        category = note.category or ""
-        tags = ", ".join(note.get_tags()) if note.get_tags() else ""
-        keywords = ", ".join(note.get_keywords()) if note.get_keywords() else ""
-
-        lines.append(f"NOTE {i}: #{note_id} - {title}")
-        lines.append(f"Created: {created}")
-
-        if category:
-            lines.append(f"Category: [{category.upper()}]")
-
-        if tags:
-            lines.append(f"Tags: 🏷️  {tags}")
-
-        if keywords:
-            lines.append(f"Keywords: {keywords}")
-
-        lines.append(f"\nContent:\n{note.content}")
-        lines.append("\n" + "=" * 80 + "\n")
+        tags = ", ".join(note.get_tags())
+        keywords = ", ".join(note.get_keywords())
+        category_line = f"\nCategory: [{note.category.upper()}]" if note.category else ""
+        tags_line = f"\nTags: 🏷️  {tags}" if tags else ""
+        keywords_line = f"\nKeywords: {keywords}" if keywords else ""
+
+        lines.append(
+            f"\nNOTE {i}: #{note_id} - {title}\nCreated: {created}{category_line}{tags_line}{keywords_line}"
+            f"\n\nContent:\n{note.content}\n\n{rule}\n"
+        )
 
-    lines.append(f"\n💡 Analyze the notes above and answer the user's question. Cite specific note IDs when referencing information.")
+    lines.append("\n\n💡 Analyze the notes above and answer the user's question. Cite specific note IDs when referencing information.")
 
-    return "\n".join(lines)
+    return "".join(lines)
 
 
 @tool
@@ -1465,17 +1528,16 @@ def search_notes_by_tags(tags: str, limit: int = 10) -> str:
         )
 
         # Filter results by tags
+        tag_set = frozenset(tag_list)
         filtered_results = []
         for result in results:
             note_tags = result["metadata"].get("tags", "")
-            if note_tags:
-                note_tag_list = note_tags.split(",")
-                # Check if any requested tag matches
-                if any(tag in note_tag_list for tag in tag_list):
-                    filtered_results.append(result)
-
-        # Trim to requested limit
-        filtered_results = filtered_results[:limit]
+            # Check if any requested tag matches
+            if note_tags and not tag_set.isdisjoint(note_tags.split(",")):
+                filtered_results.append(result)
+                # Stop at the requested limit
+                if len(filtered_results) >= limit:
+                    break
 
         if not filtered_results:
             return f"No notes found with tags: {', '.join(tag_list)}"
@@ -1501,11 +1563,96 @@ def search_notes_by_tags(tags: str, limit: int = 10) -> str:
 
     except Exception as e:
         return f"❌ Search failed: {str(e)}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
+
+
+@lru_cache(maxsize=256)
+def _created_date_range(date_string: str, today_date: date) -> Optional[Tuple[datetime, datetime, str]]:
+    """
+    Resolve a date phrase to the [start, end) range of creation times it covers.
+
+    Relative phrases look back ("friday" is the most recent Friday). Cached
+    per phrase and day, so repeated phrases skip the parsing entirely.
+
+    Returns:
+        (start, end, label), or None if the phrase can't be parsed
+    """
+    today = datetime.combine(today_date, datetime.min.time())
+    date_lower = date_string.lower()
+    bucket = _date_bucket(date_lower)
+    target_day = _find_weekday(date_lower)
+
+    # Handle special cases first
+    if bucket == "today":
+        start_date = today
+        end_date = today + timedelta(days=1)
+        date_label = today.strftime('%A, %B %d, %Y')
+
+    elif bucket == "yesterday":
+        start_date = today - timedelta(days=1)
+        end_date = today
+        date_label = (today - timedelta(days=1)).strftime('%A, %B %d, %Y')
+
+    elif bucket == "this_week":
+        # Monday to Sunday of current week
+        days_since_monday = today.weekday()
+        start_date = today - timedelta(days=days_since_monday)
+        end_date = start_date + timedelta(days=7)
+        date_label = f"this week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
+
+    elif bucket == "last_week":
+        # Previous Monday to Sunday
+        days_since_monday = today.weekday()
+        this_monday = today - timedelta(days=days_since_monday)
+        start_date = this_monday - timedelta(days=7)
+        end_date = this_monday
+        date_label = f"last week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
+
+    elif bucket == "this_month":
+        # First day of current month to today
+        start_date = datetime(today.year, today.month, 1)
+        # Last day of current month
+        if today.month == 12:
+            end_date = datetime(today.year + 1, 1, 1)
+        else:
+            end_date = datetime(today.year, today.month + 1, 1)
+        date_label = today.strftime('%B %Y')
+
+    elif bucket == "last_month":
+        # First day to last day of previous month
+        if today.month == 1:
+            start_date = datetime(today.year - 1, 12, 1)
+            end_date = datetime(today.year, 1, 1)
+            date_label = start_date.strftime('%B %Y')
+        else:
+            start_date = datetime(today.year, today.month - 1, 1)
+            end_date = datetime(today.year, today.month, 1)
+            date_label = start_date.strftime('%B %Y')
+
+    elif target_day is not None:
+        # Specific day of week - find most recent occurrence (including today)
+        days_ago = (today.weekday() - target_day) % 7
+        if days_ago == 0:
+            # Today is the target day
+            parsed_date = today
+        else:
+            # Find most recent occurrence
+            parsed_date = today - timedelta(days=days_ago)
+
+        start_date = parsed_date
+        end_date = parsed_date + timedelta(days=1)
+        date_label = parsed_date.strftime('%A, %B %d, %Y')
+
+    else:
+        # Try ISO format or dateparser
+        parsed_date = _parse_date(date_string, prefer="past")
+        if parsed_date is None:
+            return None
+
+        start_date = datetime(parsed_date.year, parsed_date.month, parsed_date.day, 0, 0, 0)
+        end_date = start_date + timedelta(days=1)
+        date_label = parsed_date.strftime('%A, %B %d, %Y')
+
+    return start_date, end_date, date_label
 
 
 @tool
@@ -1530,105 +1677,10 @@ def list_notes_by_date(date_string: str, limit: int = 100) -> str:
     service = get_note_service()
 
     try:
-        from datetime import datetime, timedelta
-
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        date_lower = date_string.lower()
-
-        # Handle special cases first
-        if "today" in date_lower:
-            start_date = today
-            end_date = today + timedelta(days=1)
-            date_label = today.strftime('%A, %B %d, %Y')
-
-        elif "yesterday" in date_lower:
-            start_date = today - timedelta(days=1)
-            end_date = today
-            date_label = (today - timedelta(days=1)).strftime('%A, %B %d, %Y')
-
-        elif "this week" in date_lower:
-            # Monday to Sunday of current week
-            days_since_monday = today.weekday()
-            start_date = today - timedelta(days=days_since_monday)
-            end_date = start_date + timedelta(days=7)
-            date_label = f"this week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
-
-        elif "last week" in date_lower:
-            # Previous Monday to Sunday
-            days_since_monday = today.weekday()
-            this_monday = today - timedelta(days=days_since_monday)
-            start_date = this_monday - timedelta(days=7)
-            end_date = this_monday
-            date_label = f"last week ({start_date.strftime('%b %d')} - {(end_date - timedelta(days=1)).strftime('%b %d')})"
-
-        elif "this month" in date_lower:
-            # First day of current month to today
-            start_date = datetime(today.year, today.month, 1)
-            # Last day of current month
-            if today.month == 12:
-                end_date = datetime(today.year + 1, 1, 1)
-            else:
-                end_date = datetime(today.year, today.month + 1, 1)
-            date_label = today.strftime('%B %Y')
-
-        elif "last month" in date_lower:
-            # First day to last day of previous month
-            if today.month == 1:
-                start_date = datetime(today.year - 1, 12, 1)
-                end_date = datetime(today.year, 1, 1)
-                date_label = start_date.strftime('%B %Y')
-            else:
-                start_date = datetime(today.year, today.month - 1, 1)
-                end_date = datetime(today.year, today.month, 1)
-                date_label = start_date.strftime('%B %Y')
-
-        elif any(day in date_lower for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]):
-            # Specific day of week - find most recent occurrence (including today)
-            target_days = {
-                "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-                "friday": 4, "saturday": 5, "sunday": 6
-            }
-
-            target_day = None
-            for day_name, day_num in target_days.items():
-                if day_name in date_lower:
-                    target_day = day_num
-                    break
-
-            if target_day is not None:
-                days_ago = (today.weekday() - target_day) % 7
-                if days_ago == 0:
-                    # Today is the target day
-                    parsed_date = today
-                else:
-                    # Find most recent occurrence
-                    parsed_date = today - timedelta(days=days_ago)
-
-                start_date = parsed_date
-                end_date = parsed_date + timedelta(days=1)
-                date_label = parsed_date.strftime('%A, %B %d, %Y')
-            else:
-                return f"❌ Could not determine which day of the week from '{date_string}'"
-
-        else:
-            # Try dateparser or ISO format
-            parsed_date = None
-
-            if HAS_DATEPARSER:
-                try:
-                    parsed_date = dateparser.parse(date_string, settings={'PREFER_DATES_FROM': 'past'})
-                except:
-                    pass
-
-            if not parsed_date:
-                try:
-                    parsed_date = datetime.fromisoformat(date_string)
-                except:
-                    return f"❌ Could not parse date '{date_string}'. Try formats like 'today', 'yesterday', 'this week', 'last week', or ISO format (YYYY-MM-DD)."
-
-            start_date = datetime(parsed_date.year, parsed_date.month, parsed_date.day, 0, 0, 0)
-            end_date = start_date + timedelta(days=1)
-            date_label = parsed_date.strftime('%A, %B %d, %Y')
+        date_range = _created_date_range(date_string, date.today())
+        if date_range is None:
+            return f"❌ Could not parse date '{date_string}'. Try formats like 'today', 'yesterday', 'this week', 'last week', or ISO format (YYYY-MM-DD)."
+        start_date, end_date, date_label = date_range
 
         notes = service.list_by_date_range(start_date, end_date, limit=limit)
 
@@ -1639,32 +1691,24 @@ def list_notes_by_date(date_string: str, limit: int = 100) -> str:
 
         for note in notes:
             title_display = note.title or "Untitled"
-            preview = note.content[:100] + "..." if len(note.content) > 100 else note.content
-            created_time = note.created_at.strftime('%I:%M %p')
-
-            lines.append(f"📝 Note #{note.id}: {title_display}")
-            lines.append(f"   Created: {created_time}")
+            preview = note.content[:100] + ("..." if len(note.content) > 100 else "")
+            created_time = _format_clock(note.created_at)
 
             # Add category and tags if available
-            if note.category:
-                lines.append(f"   Category: [{note.category.upper()}]")
-
-            tags = note.get_tags() if hasattr(note, 'get_tags') else []
-            if tags:
-                lines.append(f"   Tags: 🏷️  {', '.join(tags)}")
-
-            lines.append(f"   Preview: {preview}")
-            lines.append("")  # Blank line between notes
+            category_line = f"\n   Category: [{note.category.upper()}]" if note.category else ""
+            tags = note.get_tags()
+            tags_line = f"\n   Tags: 🏷️  {', '.join(tags)}" if tags else ""
+
+            # Blank line between notes
+            lines.append(
+                f"\n📝 Note #{note.id}: {title_display}\n   Created: {created_time}"
+                f"{category_line}{tags_line}\n   Preview: {preview}\n"
+            )
 
-        return "\n".join(lines)
+        return "".join(lines)
 
     except Exception as e:
         return f"❌ Error listing notes by date: {str(e)}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
 
 
 @tool
@@ -1686,10 +1730,7 @@ def list_imported_notes(limit: int = 20) -> str:
     service = get_note_service()
 
     try:
-        # Get all notes and filter by note_type="imported"
-        all_notes = service.list_all(limit=limit * 2)  # Get more for filtering
-        imported_notes = [note for note in all_notes if note.note_type == "imported"]
-        imported_notes = imported_notes[:limit]  # Trim to limit
+        imported_notes = service.list_by_type("imported", limit=limit)
 
         if not imported_notes:
             return "No imported notes found. You can import notes using the /import command."
@@ -1697,33 +1738,26 @@ def list_imported_notes(limit: int = 20) -> str:
         lines = [f"📦 Imported Notes ({len(imported_notes)}):\n"]
         for note in imported_notes:
             title_display = note.title or "Untitled"
-            preview = note.content[:150] + "..." if len(note.content) > 150 else note.content
-            lines.append(f"📝 Note #{note.id}: {title_display}")
+            preview = note.content[:150] + ("..." if len(note.content) > 150 else "")
 
             # Add category and tags if available
-            if note.category:
-                lines.append(f"   Category: [{note.category.upper()}]")
-
-            tags = note.get_tags() if hasattr(note, 'get_tags') else []
-            if tags:
-                lines.append(f"   Tags: 🏷️  {', '.join(tags)}")
+            category_line = f"\n   Category: [{note.category.upper()}]" if note.category else ""
+            tags = note.get_tags()
+            tags_line = f"\n   Tags: 🏷️  {', '.join(tags)}" if tags else ""
 
             # Show import date
-            if note.created_at:
-                lines.append(f"   Imported: {note.created_at.strftime('%Y-%m-%d %H:%M')}")
+            imported_line = f"\n   Imported: {note.created_at:%Y-%m-%d %H:%M}" if note.created_at else ""
 
-            lines.append(f"   Preview: {preview}")
-            lines.append("")  # Blank line between notes
+            # Blank line between notes
+            lines.append(
+                f"\n📝 Note #{note.id}: {title_display}"
+                f"{category_line}{tags_line}{imported_line}\n   Preview: {preview}\n"
+            )
 
-        return "\n".join(lines)
+        return "".join(lines)
 
     except Exception as e:
         return f"❌ Failed to list imported notes: {str(e)}"
-    finally:
-        try:
-            service.close()
-        except:
-            pass
 
 
 @tool
@@ -1763,6 +1797,20 @@ def extract_todos_from_notes(note_ids: list[int]) -> str:
     return f"__EXTRACT_TODOS_INTERACTIVE__|{note_ids_str}__"
 
 
+# Action phrases for detect_email_instructions_in_note, one group per action type
+_EMAIL_ACTION_RE = re.compile(
+    r"(?:send\s+(?:over\s+)?(?:the\s+)?|share\s+(?:the\s+)?|email\s+(?:them\s+)?(?:the\s+)?)(?P<send_resources>\w+)"
+    r"|(?:follow\s+up\s+(?:with\s+)?|reach\s+out\s+(?:to\s+)?)(?P<follow_up>\w+)?",
+    re.IGNORECASE,
+)
+
+# Words every action phrase starts with; notes without any skip the regex
+_EMAIL_ACTION_TRIGGERS = ("send", "share", "email", "follow", "reach")
+
+# Note keywords that mark an email action item
+_EMAIL_KEYWORDS = frozenset({"email", "send", "share", "follow-up", "reach-out"})
+
+
 def detect_email_instructions_in_note(note) -> dict:
     """
     Detect email-related action items in note content.
@@ -1773,22 +1821,7 @@ def detect_email_instructions_in_note(note) -> dict:
         - recipient: str or None
         - mentioned_items: list[str]
     """
-    import re
-
-    content = note.content.lower()
-    keywords = note.get_keywords() if hasattr(note, "get_keywords") else []
-
-    # Action phrase patterns
-    send_patterns = [
-        r"send\s+(?:over\s+)?(?:the\s+)?(\w+)",
-        r"share\s+(?:the\s+)?(\w+)",
-        r"email\s+(?:them\s+)?(?:the\s+)?(\w+)",
-    ]
-
-    follow_up_patterns = [
-        r"follow\s+up\s+(?:with\s+)?(\w+)?",
-        r"reach\s+out\s+(?:to\s+)?(\w+)?",
-    ]
+    keywords = note.get_keywords()
 
     result = {
         "has_instruction": False,
@@ -1797,27 +1830,24 @@ def detect_email_instructions_in_note(note) -> dict:
         "mentioned_items": [],
     }
 
-    # Check for send/share patterns
-    for pattern in send_patterns:
-        matches = re.findall(pattern, content)
-        if matches:
-            result["has_instruction"] = True
-            result["action_type"] = "send_resources"
-            result["mentioned_items"].extend(matches)
-
-    # Check for follow-up patterns
-    for pattern in follow_up_patterns:
-        matches = re.findall(pattern, content)
-        if matches:
+    # Check for send/share and follow-up patterns in one pass
+    content_lower = note.content.lower()
+    if any(trigger in content_lower for trigger in _EMAIL_ACTION_TRIGGERS):
+        for match in _EMAIL_ACTION_RE.finditer(note.content):
             result["has_instruction"] = True
-            if not result["action_type"]:
-                result["action_type"] = "follow_up"
-            if matches[0]:
-                result["recipient"] = matches[0]
+            item = match.group("send_resources")
+            if item is not None:
+                result["action_type"] = "send_resources"
+                result["mentioned_items"].append(item.lower())
+            else:
+                if not result["action_type"]:
+                    result["action_type"] = "follow_up"
+                recipient = match.group("follow_up")
+                if recipient and not result["recipient"]:
+                    result["recipient"] = recipient.lower()
 
     # Check keywords for email-related terms
-    email_keywords = {"email", "send", "share", "follow-up", "reach-out"}
-    if any(kw in email_keywords for kw in keywords):
+    if not _EMAIL_KEYWORDS.isdisjoint(keywords):
         result["has_instruction"] = True
         if not result["action_type"]:
             result["action_type"] = "custom"
@@ -1825,6 +1855,64 @@ def detect_email_instructions_in_note(note) -> dict:
     return result
 
 
+# Static email-drafting instructions, sent as a cacheable system block
+_EMAIL_GUIDELINES = """Generate a professional email based on the context the user provides.
+
+Guidelines:
+- Use professional but warm tone
+- Include clear subject line
+- Structure with greeting, body paragraphs, and closing
+- Include action items or next steps if applicable
+- Reference any resources or materials mentioned in context
+- Keep formatting clean and readable
+
+Generate a complete, ready-to-send email draft."""
+
+_EMAIL_SYSTEM_MESSAGE = SystemMessage(
+    content=[{"type": "text", "text": _EMAIL_GUIDELINES, "cache_control": {"type": "ephemeral"}}]
+)
+
+
+@lru_cache(maxsize=1)
+def _get_structured_email_llm():
+    """Get the email-drafting LLM with structured output (built once)."""
+    from langchain_anthropic import ChatAnthropic
+
+    llm = ChatAnthropic(model="claude-3-5-sonnet-20241022", temperature=0.7)
+    return llm.with_structured_output(EmailDraft)
+
+
+def _draft_email(context: str, recipient: Optional[str], email_type: Optional[str]) -> EmailDraft:
+    """
+    Draft an email, reusing a cached draft for the same or very similar context.
+
+    Drafts are only reused for the same recipient and email type.
+    """
+    cache = get_search_cache("emails", similarity=get_settings().email_cache_similarity)
+    params = ((recipient or "").strip().lower(), (email_type or "").strip().lower())
+    key = (context,) + params
+
+    cached = cache.get(key)
+    if cached:
+        return EmailDraft(**cached[0])
+
+    context_embedding = embed_text(context)
+    cached = cache.get_similar(params, context_embedding)
+    if cached:
+        return EmailDraft(**cached[0])
+
+    # Static guidelines go first so they can be served from the prompt cache
+    prompt = f"""Context:
+{context}
+
+Recipient: {recipient if recipient else "To be determined"}
+Email Type: {email_type if email_type else "auto-detect from context"}"""
+
+    email_draft = _get_structured_email_llm().invoke([_EMAIL_SYSTEM_MESSAGE, HumanMessage(content=prompt)])
+    cache.put(key, params, context_embedding, [email_draft.model_dump()])
+    return email_draft
+
+
 @tool
 def generate_email(
     context: str, recipient: Optional[str] = None, email_type: Optional[str] = None
@@ -1847,50 +1935,21 @@ def generate_email(
     Returns:
         Formatted email draft with subject and body
     """
-    from terminal_todos.core.email_service import get_email_service
-    from langchain_anthropic import ChatAnthropic
-
-    # Initialize LLM for email generation
-    llm = ChatAnthropic(model="claude-3-5-sonnet-20241022", temperature=0.7)
-
-    # Create structured output LLM
-    structured_llm = llm.with_structured_output(EmailDraft)
-
-    # Build prompt using system templates and context
-    prompt = f"""Generate a professional email based on the following context.
-
-Context:
-{context}
-
-Recipient: {recipient if recipient else "To be determined"}
-Email Type: {email_type if email_type else "auto-detect from context"}
-
-Guidelines:
-- Use professional but warm tone
-- Include clear subject line
-- Structure with greeting, body paragraphs, and closing
-- Include action items or next steps if applicable
-- Reference any resources or materials mentioned in context
-- Keep formatting clean and readable
-
-Generate a complete, ready-to-send email draft."""
-
     try:
-        # Generate email using LLM
-        email_draft = structured_llm.invoke(prompt)
+        # Generate email using LLM (or reuse a draft for similar context)
+        email_draft = _draft_email(context, recipient, email_type)
 
         # Save to database
         email_service = get_email_service()
-        try:
-            saved_email = email_service.create_email(
-                subject=email_draft.subject,
-                body=email_draft.body,
-                recipient=email_draft.recipient,
-                template_type=email_draft.template_type,
-            )
+        saved_email = email_service.create_email(
+            subject=email_draft.subject,
+            body=email_draft.body,
+            recipient=email_draft.recipient,
+            template_type=email_draft.template_type,
+        )
 
-            # Format for display
-            output = f"""✉️ **Generated Email Draft** (ID: {saved_email.id})
+        # Format for display
+        output = f"""✉️ **Generated Email Draft** (ID: {saved_email.id})
 
 **Subject:** {email_draft.subject}
 **To:** {email_draft.recipient}
@@ -1905,9 +1964,7 @@ Generate a complete, ready-to-send email draft."""
 ✓ Email copied to clipboard and saved as draft #{saved_email.id}
 💡 Use `/copy-email` to copy again or `/list-emails` to see all drafts"""
 
-            return output
-        finally:
-            email_service.close()
+        return output
 
     except Exception as e:
         return f"❌ Error generating email: {str(e)}"
@@ -1930,27 +1987,20 @@ def list_email_drafts(limit: int = 10) -> str:
     Returns:
         Formatted list of recent email drafts
     """
-    from terminal_todos.core.email_service import get_email_service
-
     service = get_email_service()
-    try:
-        emails = service.list_recent_emails(limit)
-
-        if not emails:
-            return "📭 No email drafts found."
+    emails = service.list_recent_emails(limit)
 
-        output = [f"📧 **Recent Email Drafts** ({len(emails)}):\n"]
+    if not emails:
+        return "📭 No email drafts found."
 
-        for email in emails:
-            created = email.created_at.strftime("%Y-%m-%d %H:%M")
-            output.append(f"#{email.id} - {email.subject}")
-            output.append(
-                f"   To: {email.recipient or 'N/A'} | {email.template_type or 'custom'} | {created}\n"
-            )
+    output = [f"📧 **Recent Email Drafts** ({len(emails)}):\n"]
+    output.extend(
+        f"\n#{email.id} - {email.subject}"
+        f"\n   To: {email.recipient or 'N/A'} | {email.template_type or 'custom'} | {email.created_at:%Y-%m-%d %H:%M}\n"
+        for email in emails
+    )
 
-        return "\n".join(output)
-    finally:
-        service.close()
+    return "".join(output)
 
 
 @tool
@@ -1969,16 +2019,13 @@ def get_email_draft(email_id: int) -> str:
     Returns:
         Formatted email content
     """
-    from terminal_todos.core.email_service import get_email_service
-
     service = get_email_service()
-    try:
-        email = service.get_email(email_id)
+    email = service.get_email(email_id)
 
-        if not email:
-            return f"❌ Email draft #{email_id} not found."
+    if not email:
+        return f"❌ Email draft #{email_id} not found."
 
-        output = f"""✉️ **Email Draft #{email.id}**
+    output = f"""✉️ **Email Draft #{email.id}**
 
 **Subject:** {email.subject}
 **To:** {email.recipient or 'N/A'}
@@ -1993,13 +2040,11 @@ def get_email_draft(email_id: int) -> str:
 
 💡 Use `/copy-email {email_id}` to copy this email to clipboard"""
 
-        return output
-    finally:
-        service.close()
+    return output
 
 
-# List of all tools
-ALL_TOOLS = [
+# All tools (immutable, shared at module level)
+ALL_TOOLS = (
     get_current_date,
     create_todo,
     list_todos,
@@ -2034,4 +2079,7 @@ ALL_TOOLS = [
     generate_email,
     list_email_drafts,
     get_email_draft,
-]
+)
+
+# OpenAI tool schemas for ALL_TOOLS, generated once at import
+ALL_TOOL_SCHEMAS = tuple(convert_to_openai_tool(t) for t in ALL_TOOLS)
@@ -1,6 +1,7 @@
 """Configuration management for Terminal Todos."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -63,6 +64,47 @@ class Settings(BaseSettings):
         default=10, description="Maximum number of search results to return"
     )
 
+    # LLM response cache
+    enable_llm_cache: bool = Field(
+        default=False,
+        description="Reuse agent LLM responses for identical conversations (same model, tools and messages)"
+    )
+
+    llm_cache_size: int = Field(
+        default=256, description="Maximum number of cached agent LLM responses"
+    )
+
+    max_history_messages: int = Field(
+        default=50, description="Maximum number of messages kept in agent state"
+    )
+
+    llm_concurrency: int = Field(
+        default=8, description="Maximum concurrent agent runs in batch mode"
+    )
+
+    tool_concurrency: int = Field(
+        default=4, description="Maximum tool calls from one agent turn that run concurrently"
+    )
+
+    # Vector search cache
+    search_cache_size: int = Field(
+        default=128, description="Maximum number of cached search results per collection (0 disables)"
+    )
+
+    search_cache_ttl: float = Field(
+        default=600.0, description="Seconds a cached search result stays valid"
+    )
+
+    search_cache_similarity: float = Field(
+        default=0.93,
+        description="Cosine similarity above which a cached search for a similar query is reused (1.0 disables)"
+    )
+
+    email_cache_similarity: float = Field(
+        default=0.95,
+        description="Cosine similarity above which a cached email draft for similar context is reused (1.0 disables)"
+    )
+
     # Debugging
     verbose_logging: bool = Field(
         default=False,
@@ -96,20 +138,14 @@ class Settings(BaseSettings):
         self.chroma_path.mkdir(parents=True, exist_ok=True)
 
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get or create the global settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-        _settings.ensure_data_dir()
-    return _settings
+    settings = Settings()
+    settings.ensure_data_dir()
+    return settings
 
 
 def reset_settings() -> None:
     """Reset the global settings instance (useful for testing)."""
-    global _settings
-    _settings = None
+    get_settings.cache_clear()
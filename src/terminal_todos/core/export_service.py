@@ -1,13 +1,19 @@
 """Export service for creating portable backups of all application data."""
 
-import json
 import os
 import shutil
+import sqlite3
 import tempfile
 import zipfile
-from datetime import datetime
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from terminal_todos.config import get_settings
 from terminal_todos.db.connection import get_session
@@ -20,6 +26,31 @@ from terminal_todos.db.repositories import (
 )
 
 
+def _load_json_list(value: Optional[str]) -> List:
+    """Decode a JSON array column, treating empty or invalid values as []."""
+    if not value:
+        return []
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return []
+
+
+def _backup_database(source: Path, target: Path) -> None:
+    """Copy a SQLite database with the online backup API (a consistent snapshot, even mid-write)."""
+    with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(target)) as dst:
+        src.backup(dst, pages=1000)
+
+
+def _run_in_own_session(export: Callable[[Session], List[Dict]]) -> List[Dict]:
+    """Run an export query in a dedicated session (sessions aren't thread-safe)."""
+    session = get_session()
+    try:
+        return export(session)
+    finally:
+        session.close()
+
+
 class ExportService:
     """Service for exporting all application data to portable format."""
 
@@ -47,31 +78,27 @@ class ExportService:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"terminal-todos-export-{timestamp}.zip"
 
-        # Create temporary directory for staging
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        json_data = self._export_data_to_json()
+        db_path = Path(self.settings.db_path)
 
-            # Export JSON data
-            json_data = self._export_data_to_json()
-            json_path = temp_path / "data_export.json"
-            with open(json_path, "w") as f:
-                json.dump(json_data, f, indent=2)
+        # Write each member straight into the ZIP (no staging copies on disk)
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            # Export JSON data (orjson serializes datetimes natively)
+            with zipf.open("data_export.json", "w") as f:
+                self._write_json_export(f, json_data)
 
-            # Copy SQLite database
-            db_path = Path(self.settings.db_path)
+            # Snapshot SQLite database (stored uncompressed; deflating pages costs far more than it saves)
             if db_path.exists():
-                shutil.copy(db_path, temp_path / "todos.db")
+                db_info = zipfile.ZipInfo.from_file(db_path, "todos.db")
+                db_info.compress_type = zipfile.ZIP_STORED
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    snapshot_path = Path(temp_dir) / "todos.db"
+                    _backup_database(db_path, snapshot_path)
+                    with open(snapshot_path, "rb") as src, zipf.open(db_info, "w", force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
 
             # Create human-readable manifest
-            manifest_path = temp_path / "export_manifest.txt"
-            self._create_manifest(manifest_path, json_data["export_metadata"])
-
-            # Create ZIP file
-            with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                zipf.write(json_path, "data_export.json")
-                if (temp_path / "todos.db").exists():
-                    zipf.write(temp_path / "todos.db", "todos.db")
-                zipf.write(manifest_path, "export_manifest.txt")
+            zipf.writestr("export_manifest.txt", self._build_manifest(json_data["export_metadata"]))
 
         return {
             "output_path": output_path,
@@ -79,27 +106,37 @@ class ExportService:
         }
 
     def _export_data_to_json(self) -> Dict:
-        """Export all data to JSON-serializable format."""
+        """
+        Export all data to an orjson-serializable dict (datetimes stay datetimes).
+
+        Events are only counted here; _write_json_export streams them.
+        """
         # Get schema version from metadata table
         schema_version = self._get_schema_version()
 
-        # Export all entities
-        todos = self._export_todos_to_json()
-        notes = self._export_notes_to_json()
-        emails = self._export_emails_to_json()
-        events = self._export_events_to_json()
+        # Export all entities concurrently, each in its own session
+        exporters = (
+            self._export_todos_to_json,
+            self._export_notes_to_json,
+            self._export_emails_to_json,
+        )
+        with ThreadPoolExecutor(max_workers=len(exporters)) as executor:
+            futures = [executor.submit(_run_in_own_session, export) for export in exporters]
+            todos, notes, emails = [future.result() for future in futures]
+
+        event_count = self.session.scalar(select(func.count()).select_from(Event))
 
         # Create export metadata
         export_metadata = {
             "version": "1.0",
             "schema_version": schema_version,
-            "export_timestamp": datetime.utcnow().isoformat() + "Z",
+            "export_timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
             "source_app": "terminal-todos",
             "counts": {
                 "todos": len(todos),
                 "notes": len(notes),
                 "emails": len(emails),
-                "events": len(events),
+                "events": event_count,
             },
         }
 
@@ -108,85 +145,123 @@ class ExportService:
             "todos": todos,
             "notes": notes,
             "emails": emails,
-            "events": events,
         }
 
-    def _export_todos_to_json(self) -> List[Dict]:
+    def _write_json_export(self, f: BinaryIO, json_data: Dict) -> None:
+        """
+        Write the JSON export, streaming the audit log in batches.
+
+        Everything but the events is serialized in one go; the events array is
+        appended row by row so memory stays bounded however large it grows.
+        """
+        # OPT_INDENT_2 output always ends in "\n}" - reopen the object to add events
+        f.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2)[:-2])
+        f.write(b',\n  "events": [')
+        count = 0
+        for event in self._iter_events():
+            f.write(b",\n    " if count else b"\n    ")
+            f.write(orjson.dumps(event))
+            count += 1
+        f.write(b"\n  ]\n}" if count else b"]\n}")
+
+    def _export_todos_to_json(self, session: Session) -> List[Dict]:
         """Export all todos to JSON format."""
-        todos = self.todo_repo.list_all(limit=100000)
-        return [
-            {
-                "id": todo.id,
-                "content": todo.content,
-                "completed": todo.completed,
-                "created_at": todo.created_at.isoformat() if todo.created_at else None,
-                "completed_at": todo.completed_at.isoformat()
-                if todo.completed_at
-                else None,
-                "due_date": todo.due_date.isoformat() if todo.due_date else None,
-                "note_id": todo.note_id,
-                "priority": todo.priority,
-                "focus_order": todo.focus_order,
-            }
-            for todo in todos
-        ]
+        rows = session.execute(
+            select(
+                Todo.id,
+                Todo.content,
+                Todo.completed,
+                Todo.created_at,
+                Todo.completed_at,
+                Todo.due_date,
+                Todo.note_id,
+                Todo.priority,
+                Todo.focus_order,
+            )
+            .order_by(Todo.completed.asc(), Todo.priority.desc(), Todo.created_at.desc())
+            .limit(100000)
+        ).mappings()
+        return [dict(row) for row in rows]
 
-    def _export_notes_to_json(self) -> List[Dict]:
+    def _export_notes_to_json(self, session: Session) -> List[Dict]:
         """Export all notes with metadata to JSON format."""
-        notes = self.note_repo.list_all(limit=100000)
+        rows = session.execute(
+            select(
+                Note.id,
+                Note.content,
+                Note.title,
+                Note.created_at,
+                Note.updated_at,
+                Note.note_type,
+                Note.keywords,
+                Note.topics,
+                Note.summary,
+                Note.category,
+                Note.tags,
+            )
+            .order_by(Note.created_at.desc())
+            .limit(100000)
+        )
         return [
             {
-                "id": note.id,
-                "content": note.content,
-                "title": note.title,
-                "created_at": note.created_at.isoformat() if note.created_at else None,
-                "updated_at": note.updated_at.isoformat() if note.updated_at else None,
-                "note_type": note.note_type,
-                "keywords": note.get_keywords(),  # Parsed from JSON string
-                "topics": note.get_topics(),  # Parsed from JSON string
-                "summary": note.summary,
-                "category": note.category,
-                "tags": note.get_tags(),  # Parsed from JSON string
+                "id": row.id,
+                "content": row.content,
+                "title": row.title,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+                "note_type": row.note_type,
+                "keywords": _load_json_list(row.keywords),
+                "topics": _load_json_list(row.topics),
+                "summary": row.summary,
+                "category": row.category,
+                "tags": _load_json_list(row.tags),
             }
-            for note in notes
+            for row in rows
         ]
 
-    def _export_emails_to_json(self) -> List[Dict]:
+    def _export_emails_to_json(self, session: Session) -> List[Dict]:
         """Export all emails to JSON format."""
-        # Get all emails (EmailRepository doesn't have list_all, so query directly)
-        emails = self.session.query(Email).all()
+        rows = session.execute(
+            select(
+                Email.id,
+                Email.subject,
+                Email.body,
+                Email.recipient,
+                Email.context_note_ids,
+                Email.template_type,
+                Email.created_at,
+            )
+        )
         return [
             {
-                "id": email.id,
-                "subject": email.subject,
-                "body": email.body,
-                "recipient": email.recipient,
-                "context_note_ids": email.get_context_note_ids(),  # Parsed from JSON
-                "template_type": email.template_type,
-                "created_at": email.created_at.isoformat()
-                if email.created_at
-                else None,
+                "id": row.id,
+                "subject": row.subject,
+                "body": row.body,
+                "recipient": row.recipient,
+                "context_note_ids": _load_json_list(row.context_note_ids),
+                "template_type": row.template_type,
+                "created_at": row.created_at,
             }
-            for email in emails
+            for row in rows
         ]
 
-    def _export_events_to_json(self) -> List[Dict]:
-        """Export complete audit log to JSON format."""
-        # Get all events (query directly for complete history)
-        events = self.session.query(Event).order_by(Event.created_at.asc()).all()
-        return [
-            {
-                "id": event.id,
-                "event_type": event.event_type,
-                "entity_type": event.entity_type,
-                "entity_id": event.entity_id,
-                "details": event.details,  # Already a JSON string
-                "created_at": event.created_at.isoformat()
-                if event.created_at
-                else None,
-            }
-            for event in events
-        ]
+    def _iter_events(self) -> Iterator[Dict]:
+        """Iterate the complete audit log in JSON format, fetching 1000 rows at a time."""
+        # details is already a JSON string and is exported as-is
+        rows = self.session.execute(
+            select(
+                Event.id,
+                Event.event_type,
+                Event.entity_type,
+                Event.entity_id,
+                Event.details,
+                Event.created_at,
+            )
+            .order_by(Event.created_at.asc())
+            .execution_options(yield_per=1000)
+        ).mappings()
+        for row in rows:
+            yield dict(row)
 
     def _get_schema_version(self) -> int:
         """Get current schema version from metadata table."""
@@ -202,26 +277,32 @@ class ExportService:
         except Exception:
             return 0
 
-    def _create_manifest(self, manifest_path: Path, metadata: Dict) -> None:
-        """Create human-readable manifest file."""
-        with open(manifest_path, "w") as f:
-            f.write("=" * 60 + "\n")
-            f.write("TERMINAL TODOS EXPORT MANIFEST\n")
-            f.write("=" * 60 + "\n\n")
-            f.write(f"Export Version: {metadata['version']}\n")
-            f.write(f"Schema Version: {metadata['schema_version']}\n")
-            f.write(f"Export Time: {metadata['export_timestamp']}\n")
-            f.write(f"Source App: {metadata['source_app']}\n\n")
-            f.write("Data Counts:\n")
-            f.write(f"  Todos:  {metadata['counts']['todos']}\n")
-            f.write(f"  Notes:  {metadata['counts']['notes']}\n")
-            f.write(f"  Emails: {metadata['counts']['emails']}\n")
-            f.write(f"  Events: {metadata['counts']['events']}\n\n")
-            f.write("Files Included:\n")
-            f.write("  - data_export.json (JSON export with all data)\n")
-            f.write("  - todos.db (SQLite database backup)\n")
-            f.write("  - export_manifest.txt (this file)\n\n")
-            f.write("=" * 60 + "\n")
+    def _build_manifest(self, metadata: Dict) -> str:
+        """Build the human-readable manifest text."""
+        rule = "=" * 60
+        counts = metadata["counts"]
+        return f"""{rule}
+TERMINAL TODOS EXPORT MANIFEST
+{rule}
+
+Export Version: {metadata['version']}
+Schema Version: {metadata['schema_version']}
+Export Time: {metadata['export_timestamp']}
+Source App: {metadata['source_app']}
+
+Data Counts:
+  Todos:  {counts['todos']}
+  Notes:  {counts['notes']}
+  Emails: {counts['emails']}
+  Events: {counts['events']}
+
+Files Included:
+  - data_export.json (JSON export with all data)
+  - todos.db (SQLite database backup)
+  - export_manifest.txt (this file)
+
+{rule}
+"""
 
     def close(self):
         """Close database session."""
@@ -1,18 +1,24 @@
 """Import service for restoring data from export archives."""
 
-import json
 import os
 import shutil
 import tempfile
 import zipfile
 from datetime import datetime
+from functools import lru_cache
+from itertools import batched, chain
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import ijson
+import orjson
+from sqlalchemy import func, insert, select, text
 
 from terminal_todos.config import get_settings
 from terminal_todos.core.sync_service import SyncService
-from terminal_todos.db.connection import get_session
-from terminal_todos.db.models import Email, Event, Note, Todo
+from terminal_todos.db.connection import get_engine, get_session
+from terminal_todos.db.migrations import CURRENT_SCHEMA_VERSION
+from terminal_todos.db.models import Base, Email, Event, Note, Todo
 from terminal_todos.db.repositories import (
     EmailRepository,
     EventRepository,
@@ -20,8 +26,51 @@ from terminal_todos.db.repositories import (
     TodoRepository,
 )
 
-# Current schema version (should match migrations.py)
-CURRENT_SCHEMA_VERSION = 6
+# Rows per INSERT statement when importing from JSON
+IMPORT_BATCH_SIZE = 1000
+
+# Buffer size for reading the ZIP and streaming todos.db out of it
+ZIP_COPY_BUFFER_SIZE = 1 << 20
+
+
+def _copy_file(source: Path, target: Path) -> None:
+    """
+    Copy a file inside the kernel.
+
+    Tries copy_file_range first (a reflink on copy-on-write filesystems like
+    Btrfs/XFS), then falls back to shutil.copyfile, which uses sendfile on Linux.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining <= 0:
+                return
+        except OSError:
+            pass  # EXDEV, ENOTSUP, ENOSYS, ... - use the portable path
+    shutil.copyfile(source, target)
+
+
+@lru_cache(maxsize=8192)
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an exported ISO timestamp, or None if empty (memoized; exports repeat timestamps)."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _iter_export_items(zip_path: str, prefix: str) -> Iterator:
+    """
+    Stream the values at an ijson prefix of data_export.json (e.g. "notes.item").
+
+    The file is parsed incrementally straight out of the ZIP, so memory stays
+    bounded by the largest single item rather than the whole export.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zf, zf.open("data_export.json") as fp:
+        yield from ijson.items(fp, prefix, use_float=True)
 
 
 class ImportService:
@@ -63,17 +112,16 @@ class ImportService:
         if issues:
             raise ValueError(f"Invalid export file: {'; '.join(issues)}")
 
-        # Extract and validate export data
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            json_data = json.loads(zf.read("data_export.json"))
+        # Read export metadata (only parses as far as the metadata block)
+        metadata = next(_iter_export_items(zip_path, "export_metadata"), {})
 
         # Validate export metadata and schema compatibility
-        issues = self._validate_export_metadata(json_data["export_metadata"])
+        issues = self._validate_export_metadata(metadata)
         if issues:
             raise ValueError(f"Export validation failed: {'; '.join(issues)}")
 
         # Validate relationships
-        issues = self._validate_relationships(json_data)
+        issues = self._validate_relationships(zip_path)
         if issues:
             raise ValueError(f"Data relationship errors: {'; '.join(issues)}")
 
@@ -93,7 +141,7 @@ class ImportService:
         if method == "sqlite":
             result = self._import_from_sqlite(zip_path)
         else:
-            result = self._import_from_json(json_data)
+            result = self._import_from_json(zip_path)
 
         # Rebuild vector store embeddings
         print("Rebuilding vector store embeddings...")
@@ -147,36 +195,47 @@ class ImportService:
 
         return issues
 
-    def _validate_relationships(self, export_data: Dict) -> List[str]:
+    def _validate_relationships(self, zip_path: str) -> List[str]:
         """Validate foreign key relationships in export data."""
         issues = []
 
         # Build index of all note IDs
-        note_ids = {note["id"] for note in export_data.get("notes", [])}
-
-        # Validate Todo.note_id → Notes.id
-        for todo in export_data.get("todos", []):
-            if todo.get("note_id") is not None and todo["note_id"] not in note_ids:
-                issues.append(
-                    f"Todo #{todo['id']} references non-existent note #{todo['note_id']}"
-                )
+        note_ids = frozenset(_iter_export_items(zip_path, "notes.item.id"))
+
+        # Validate Todo.note_id → Notes.id (collect references, then one set difference)
+        todo_refs = [
+            (todo["id"], todo["note_id"])
+            for todo in _iter_export_items(zip_path, "todos.item")
+            if todo.get("note_id") is not None
+        ]
+        missing = {note_id for _, note_id in todo_refs} - note_ids
+        if missing:
+            issues.extend(
+                f"Todo #{todo_id} references non-existent note #{note_id}"
+                for todo_id, note_id in todo_refs
+                if note_id in missing
+            )
 
         # Validate Email.context_note_ids → Notes.id
-        for email in export_data.get("emails", []):
-            context_ids = email.get("context_note_ids", [])
-            if context_ids:
-                for note_id in context_ids:
-                    if note_id not in note_ids:
-                        issues.append(
-                            f"Email #{email['id']} references non-existent note #{note_id}"
-                        )
+        email_refs = list(
+            chain.from_iterable(
+                ((email["id"], note_id) for note_id in email.get("context_note_ids") or ())
+                for email in _iter_export_items(zip_path, "emails.item")
+            )
+        )
+        missing = {note_id for _, note_id in email_refs} - note_ids
+        if missing:
+            issues.extend(
+                f"Email #{email_id} references non-existent note #{note_id}"
+                for email_id, note_id in email_refs
+                if note_id in missing
+            )
 
         return issues
 
     def _check_existing_data(self) -> Dict:
         """Check if database has existing data."""
-        todo_count = self.session.query(Todo).count()
-        note_count = self.session.query(Note).count()
+        todo_count, note_count = self._count_rows(Todo, Note)
 
         return {
             "has_data": todo_count > 0 or note_count > 0,
@@ -184,6 +243,11 @@ class ImportService:
             "notes": note_count,
         }
 
+    def _count_rows(self, *models) -> Tuple[int, ...]:
+        """Count the rows of several tables in a single SELECT of scalar subqueries."""
+        counts = [select(func.count()).select_from(model).scalar_subquery() for model in models]
+        return tuple(self.session.execute(select(*counts)).one())
+
     def _create_backup(self) -> str:
         """Create automatic backup before import."""
         db_path = Path(self.settings.db_path)
@@ -197,13 +261,13 @@ class ImportService:
         # Create timestamped backup
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = backup_dir / f"pre-import-{timestamp}.db"
-        shutil.copy(db_path, backup_path)
+        _copy_file(db_path, backup_path)
 
         print(f"Backup created: {backup_path}")
         return str(backup_path)
 
-    def _import_from_json(self, json_data: Dict) -> Dict:
-        """Import data from JSON export."""
+    def _import_from_json(self, zip_path: str) -> Dict:
+        """Import data from JSON export, streaming each table in batches."""
         try:
             # Begin transaction
             self.session.begin_nested()
@@ -212,10 +276,10 @@ class ImportService:
             self._clear_database()
 
             # Import in order: notes → todos → emails → events
-            notes_count = self._import_notes(json_data.get("notes", []))
-            todos_count = self._import_todos(json_data.get("todos", []))
-            emails_count = self._import_emails(json_data.get("emails", []))
-            events_count = self._import_events(json_data.get("events", []))
+            notes_count = self._import_notes(_iter_export_items(zip_path, "notes.item"))
+            todos_count = self._import_todos(_iter_export_items(zip_path, "todos.item"))
+            emails_count = self._import_emails(_iter_export_items(zip_path, "emails.item"))
+            events_count = self._import_events(_iter_export_items(zip_path, "events.item"))
 
             # Commit transaction
             self.session.commit()
@@ -234,139 +298,157 @@ class ImportService:
 
     def _import_from_sqlite(self, zip_path: str) -> Dict:
         """Import by replacing SQLite database file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Extract SQLite backup
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.extract("todos.db", temp_dir)
+        db_path = Path(self.settings.db_path)
+
+        # Stream the backup into a sibling temp file, so a bad archive
+        # (CRC error, truncation) never touches the live database
+        fd, temp_path = tempfile.mkstemp(suffix=".db.tmp", dir=db_path.parent)
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                with open(zip_path, "rb", buffering=ZIP_COPY_BUFFER_SIZE) as raw:
+                    with zipfile.ZipFile(raw, "r") as zf, zf.open("todos.db") as src:
+                        shutil.copyfileobj(src, dst, ZIP_COPY_BUFFER_SIZE)
 
             # Close current session
             self.session.close()
 
-            # Replace database file
-            db_path = Path(self.settings.db_path)
-            shutil.copy(Path(temp_dir) / "todos.db", db_path)
+            # Swap the database file in atomically
+            os.replace(temp_path, db_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
 
-            # Reconnect to new database
-            self.session = get_session()
-            self.todo_repo = TodoRepository(self.session)
-            self.note_repo = NoteRepository(self.session)
+        # Pooled connections still point at the replaced file
+        get_engine().dispose()
 
-            # Count imported data
-            todos_count = self.session.query(Todo).count()
-            notes_count = self.session.query(Note).count()
-            emails_count = self.session.query(Email).count()
-            events_count = self.session.query(Event).count()
+        # Reconnect to new database
+        self.session = get_session()
+        self.todo_repo = TodoRepository(self.session)
+        self.note_repo = NoteRepository(self.session)
 
-            return {
-                "todos": todos_count,
-                "notes": notes_count,
-                "emails": emails_count,
-                "events": events_count,
-            }
+        # Count imported data
+        todos_count, notes_count, emails_count, events_count = self._count_rows(
+            Todo, Note, Email, Event
+        )
 
-    def _clear_database(self) -> None:
-        """Clear all data from database tables."""
-        # Delete in reverse order of dependencies
-        self.session.query(Event).delete()
-        self.session.query(Email).delete()
-        self.session.query(Todo).delete()
-        self.session.query(Note).delete()
-        self.session.flush()
-
-    def _import_notes(self, notes_data: List[Dict]) -> int:
-        """Import notes from JSON data."""
-        for note_data in notes_data:
-            note = Note(
-                id=note_data["id"],
-                content=note_data["content"],
-                title=note_data.get("title"),
-                created_at=datetime.fromisoformat(note_data["created_at"])
-                if note_data.get("created_at")
-                else datetime.utcnow(),
-                updated_at=datetime.fromisoformat(note_data["updated_at"])
-                if note_data.get("updated_at")
-                else datetime.utcnow(),
-                note_type=note_data.get("note_type", "general"),
-                summary=note_data.get("summary"),
-                category=note_data.get("category"),
-            )
+        return {
+            "todos": todos_count,
+            "notes": notes_count,
+            "emails": emails_count,
+            "events": events_count,
+        }
 
-            # Serialize JSON fields
-            if note_data.get("keywords"):
-                note.set_keywords(note_data["keywords"])
-            if note_data.get("topics"):
-                note.set_topics(note_data["topics"])
-            if note_data.get("tags"):
-                note.set_tags(note_data["tags"])
+    def _clear_database(self) -> None:
+        """
+        Clear all data from database tables.
 
-            self.session.add(note)
+        Runs on the session's connection so it is rolled back with a failed import.
+        """
+        connection = self.session.connection()
+        tables = [model.__table__ for model in (Event, Email, Todo, Note)]
 
-        self.session.flush()
-        return len(notes_data)
+        if connection.dialect.name == "postgresql":
+            names = ", ".join(table.name for table in tables)
+            connection.execute(text(f"TRUNCATE {names} RESTART IDENTITY CASCADE"))
+        else:
+            # SQLite has no TRUNCATE; dropping a table is O(1) where DELETE scans every row
+            Base.metadata.drop_all(bind=connection, tables=tables)
+            Base.metadata.create_all(bind=connection, tables=tables)
+
+        # Loaded objects refer to rows that no longer exist
+        self.session.expunge_all()
+
+    def _insert_in_batches(self, model, rows: Iterable[Dict]) -> int:
+        """Bulk-insert row dicts for a model, IMPORT_BATCH_SIZE rows per statement."""
+        count = 0
+        for batch in batched(rows, IMPORT_BATCH_SIZE):
+            self.session.execute(insert(model), list(batch))
+            count += len(batch)
+        return count
+
+    def _import_notes(self, notes_data: Iterable[Dict]) -> int:
+        """Import notes from JSON data."""
+        now = datetime.utcnow()
+        return self._insert_in_batches(
+            Note,
+            (
+                {
+                    "id": note_data["id"],
+                    "content": note_data["content"],
+                    "title": note_data.get("title"),
+                    "created_at": _parse_timestamp(note_data.get("created_at")) or now,
+                    "updated_at": _parse_timestamp(note_data.get("updated_at")) or now,
+                    "note_type": note_data.get("note_type", "general"),
+                    "summary": note_data.get("summary"),
+                    "category": note_data.get("category"),
+                    # Serialize JSON fields
+                    "keywords": orjson.dumps(note_data["keywords"]).decode() if note_data.get("keywords") else None,
+                    "topics": orjson.dumps(note_data["topics"]).decode() if note_data.get("topics") else None,
+                    "tags": orjson.dumps(note_data["tags"]).decode() if note_data.get("tags") else None,
+                }
+                for note_data in notes_data
+            ),
+        )
 
-    def _import_todos(self, todos_data: List[Dict]) -> int:
+    def _import_todos(self, todos_data: Iterable[Dict]) -> int:
         """Import todos from JSON data."""
-        for todo_data in todos_data:
-            todo = Todo(
-                id=todo_data["id"],
-                content=todo_data["content"],
-                completed=todo_data.get("completed", False),
-                created_at=datetime.fromisoformat(todo_data["created_at"])
-                if todo_data.get("created_at")
-                else datetime.utcnow(),
-                completed_at=datetime.fromisoformat(todo_data["completed_at"])
-                if todo_data.get("completed_at")
-                else None,
-                due_date=datetime.fromisoformat(todo_data["due_date"])
-                if todo_data.get("due_date")
-                else None,
-                note_id=todo_data.get("note_id"),
-                priority=todo_data.get("priority", 0),
-                focus_order=todo_data.get("focus_order"),
-            )
-            self.session.add(todo)
-
-        self.session.flush()
-        return len(todos_data)
+        now = datetime.utcnow()
+        return self._insert_in_batches(
+            Todo,
+            (
+                {
+                    "id": todo_data["id"],
+                    "content": todo_data["content"],
+                    "completed": todo_data.get("completed", False),
+                    "created_at": _parse_timestamp(todo_data.get("created_at")) or now,
+                    "completed_at": _parse_timestamp(todo_data.get("completed_at")),
+                    "due_date": _parse_timestamp(todo_data.get("due_date")),
+                    "note_id": todo_data.get("note_id"),
+                    "priority": todo_data.get("priority", 0),
+                    "focus_order": todo_data.get("focus_order"),
+                }
+                for todo_data in todos_data
+            ),
+        )
 
-    def _import_emails(self, emails_data: List[Dict]) -> int:
+    def _import_emails(self, emails_data: Iterable[Dict]) -> int:
         """Import emails from JSON data."""
-        for email_data in emails_data:
-            email = Email(
-                id=email_data["id"],
-                subject=email_data["subject"],
-                body=email_data["body"],
-                recipient=email_data.get("recipient"),
-                context_note_ids=json.dumps(email_data.get("context_note_ids", []))
-                if email_data.get("context_note_ids")
-                else None,
-                template_type=email_data.get("template_type"),
-                created_at=datetime.fromisoformat(email_data["created_at"])
-                if email_data.get("created_at")
-                else datetime.utcnow(),
-            )
-            self.session.add(email)
-
-        self.session.flush()
-        return len(emails_data)
+        now = datetime.utcnow()
+        return self._insert_in_batches(
+            Email,
+            (
+                {
+                    "id": email_data["id"],
+                    "subject": email_data["subject"],
+                    "body": email_data["body"],
+                    "recipient": email_data.get("recipient"),
+                    "context_note_ids": orjson.dumps(email_data["context_note_ids"]).decode()
+                    if email_data.get("context_note_ids")
+                    else None,
+                    "template_type": email_data.get("template_type"),
+                    "created_at": _parse_timestamp(email_data.get("created_at")) or now,
+                }
+                for email_data in emails_data
+            ),
+        )
 
-    def _import_events(self, events_data: List[Dict]) -> int:
+    def _import_events(self, events_data: Iterable[Dict]) -> int:
         """Import events from JSON data."""
-        for event_data in events_data:
-            event = Event(
-                id=event_data["id"],
-                event_type=event_data["event_type"],
-                entity_type=event_data["entity_type"],
-                entity_id=event_data["entity_id"],
-                details=event_data.get("details"),
-                created_at=datetime.fromisoformat(event_data["created_at"])
-                if event_data.get("created_at")
-                else datetime.utcnow(),
-            )
-            self.session.add(event)
-
-        self.session.flush()
-        return len(events_data)
+        now = datetime.utcnow()
+        return self._insert_in_batches(
+            Event,
+            (
+                {
+                    "id": event_data["id"],
+                    "event_type": event_data["event_type"],
+                    "entity_type": event_data["entity_type"],
+                    "entity_id": event_data["entity_id"],
+                    "details": event_data.get("details"),
+                    "created_at": _parse_timestamp(event_data.get("created_at")) or now,
+                }
+                for event_data in events_data
+            ),
+        )
 
     def close(self):
         """Close database session."""
@@ -43,10 +43,22 @@ class NoteService:
         """Get a note by ID."""
         return self.note_repo.get(note_id)
 
+    def get_notes_bulk(self, note_ids: List[int]) -> List[Note]:
+        """Get several notes by ID in one query."""
+        return self.note_repo.get_many(note_ids)
+
     def list_all(self, limit: int = 100) -> List[Note]:
         """List all notes."""
         return self.note_repo.list_all(limit=limit)
 
+    def list_by_type(self, note_type: str, limit: int = 100) -> List[Note]:
+        """List the most recent notes of a type (e.g. "imported")."""
+        return self.note_repo.list_by_type(note_type, limit=limit)
+
+    def list_previews(self, limit: int = 100, preview_len: int = 100) -> List[Note]:
+        """List recent notes with only the first preview_len characters of content."""
+        return self.note_repo.list_previews(limit=limit, preview_len=preview_len)
+
     def delete_note(self, note_id: int) -> bool:
         """Delete a note and remove from vector store."""
         # Log before deleting
@@ -92,7 +104,7 @@ class NoteService:
 
     def get_note_count(self) -> int:
         """Get total count of notes."""
-        return len(self.list_all(limit=10000))
+        return self.note_repo.count()
 
     def list_by_date_range(self, start_date, end_date, limit: int = 100):
         """List notes created within a date range."""
@@ -173,12 +185,16 @@ class NoteService:
         from terminal_todos.utils.logger import log_debug, log_error
 
         try:
+            keywords = note.get_keywords()
+            topics = note.get_topics()
+            tags = note.get_tags()
+
             log_debug(f"Syncing note {note.id} to vector store", {
                 "title": note.title,
                 "category": note.category,
-                "keywords_count": len(note.get_keywords()),
-                "topics_count": len(note.get_topics()),
-                "tags_count": len(note.get_tags())
+                "keywords_count": len(keywords),
+                "topics_count": len(topics),
+                "tags_count": len(tags)
             })
 
             self.sync_service.vector_store.upsert_note(
@@ -188,11 +204,11 @@ class NoteService:
                 created_at=note.created_at.isoformat(),
                 note_type=note.note_type,
                 category=note.category,
-                keywords=note.get_keywords(),
-                topics=note.get_topics(),
+                keywords=keywords,
+                topics=topics,
                 summary=note.summary,
                 updated_at=note.updated_at.isoformat(),
-                tags=note.get_tags(),
+                tags=tags,
             )
 
             log_debug(f"Note {note.id} vector store sync complete")
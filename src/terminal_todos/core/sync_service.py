@@ -1,13 +1,107 @@
 """Synchronization service between database and vector store."""
 
-from typing import List
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from terminal_todos.db.connection import get_session
 from terminal_todos.db.models import Note, Todo
 from terminal_todos.db.repositories import EventRepository, NoteRepository, TodoRepository
+from terminal_todos.vector.cache import get_search_cache
 from terminal_todos.vector.store import VectorStore
 
 
+# Debounced todo syncs: updates in quick succession share one batched
+# re-embedding instead of one model pass each
+SYNC_DEBOUNCE_SECONDS = 0.25
+
+# Rows embedded per model pass during a full sync
+FULL_SYNC_BATCH_SIZE = 128
+
+_pending_todo_ids: Set[int] = set()
+_pending_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+
+
+def schedule_todo_sync(todo_id: int) -> None:
+    """
+    Queue a todo for syncing; queued todos are synced together shortly after.
+
+    Cached todo searches are dropped right away, since they no longer match
+    the database even before the vector store is written.
+    """
+    global _flush_timer
+    get_search_cache("todos").clear()
+    with _pending_lock:
+        _pending_todo_ids.add(todo_id)
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(SYNC_DEBOUNCE_SECONDS, flush_pending_todo_syncs)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def flush_pending_todo_syncs() -> int:
+    """
+    Sync all queued todos now.
+
+    Runs on the debounce timer thread (and at exit), so it uses its own
+    SyncService and database session.
+
+    Returns:
+        Number of todos synced
+    """
+    global _flush_timer
+    with _pending_lock:
+        todo_ids = list(_pending_todo_ids)
+        _pending_todo_ids.clear()
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+
+    if not todo_ids:
+        return 0
+
+    service = SyncService()
+    try:
+        return service.sync_todos_bulk(todo_ids)
+    finally:
+        service.close()
+
+
+atexit.register(flush_pending_todo_syncs)
+
+
+def _todo_payload(todo: Todo) -> Dict[str, Any]:
+    """Build the VectorStore.upsert_todo arguments for a todo."""
+    return {
+        "todo_id": todo.id,
+        "content": todo.content,
+        "completed": todo.completed,
+        "created_at": todo.created_at.isoformat(),
+        "priority": todo.priority,
+        "due_date": todo.due_date.isoformat() if todo.due_date else None,
+    }
+
+
+def _note_payload(note: Note) -> Dict[str, Any]:
+    """Build the VectorStore.upsert_note arguments for a note, with full metadata."""
+    return {
+        "note_id": note.id,
+        "content": note.content,
+        "title": note.title,
+        "created_at": note.created_at.isoformat(),
+        "note_type": note.note_type,
+        "category": note.category,
+        "keywords": note.get_keywords(),
+        "topics": note.get_topics(),
+        "summary": note.summary,
+        "updated_at": note.updated_at.isoformat() if note.updated_at else None,
+        "tags": note.get_tags(),
+    }
+
+
 class SyncService:
     """Service for synchronizing database and vector store."""
 
@@ -23,18 +117,32 @@ class SyncService:
         try:
             todo = self.todo_repo.get(todo_id)
             if todo:
-                self.vector_store.upsert_todo(
-                    todo_id=todo.id,
-                    content=todo.content,
-                    completed=todo.completed,
-                    created_at=todo.created_at.isoformat(),
-                )
+                self.vector_store.upsert_todo(**_todo_payload(todo))
                 return True
             return False
         except Exception as e:
             print(f"Error syncing todo {todo_id}: {e}")
             return False
 
+    def sync_todos_bulk(self, todo_ids: List[int]) -> int:
+        """
+        Sync several todos to the vector store with one batched embedding.
+
+        Returns:
+            Number of todos synced
+        """
+        try:
+            todos = self.todo_repo.get_many(todo_ids)
+            self.vector_store.upsert_todos([_todo_payload(todo) for todo in todos])
+            return len(todos)
+        except Exception as e:
+            print(f"Error syncing {len(todo_ids)} todos: {e}")
+            return 0
+
+    def schedule_sync(self, todo_id: int) -> None:
+        """Queue a todo for a debounced, batched sync (see schedule_todo_sync)."""
+        schedule_todo_sync(todo_id)
+
     def remove_todo(self, todo_id: int) -> bool:
         """Remove a todo from the vector store."""
         try:
@@ -44,25 +152,21 @@ class SyncService:
             print(f"Error removing todo {todo_id} from vector store: {e}")
             return False
 
+    def remove_todos(self, todo_ids: List[int]) -> bool:
+        """Remove several todos from the vector store."""
+        try:
+            self.vector_store.delete_todos(todo_ids)
+            return True
+        except Exception as e:
+            print(f"Error removing {len(todo_ids)} todos from vector store: {e}")
+            return False
+
     def sync_note(self, note_id: int) -> bool:
         """Sync a single note to the vector store with full metadata."""
         try:
             note = self.note_repo.get(note_id)
             if note:
-                # Sync with all available metadata
-                self.vector_store.upsert_note(
-                    note_id=note.id,
-                    content=note.content,
-                    title=note.title,
-                    created_at=note.created_at.isoformat(),
-                    note_type=note.note_type,
-                    category=note.category if hasattr(note, 'category') else None,
-                    keywords=note.get_keywords() if hasattr(note, 'get_keywords') else None,
-                    topics=note.get_topics() if hasattr(note, 'get_topics') else None,
-                    summary=note.summary if hasattr(note, 'summary') else None,
-                    updated_at=note.updated_at.isoformat() if note.updated_at else None,
-                    tags=note.get_tags() if hasattr(note, 'get_tags') else None,
-                )
+                self.vector_store.upsert_note(**_note_payload(note))
                 return True
             return False
         except Exception as e:
@@ -86,16 +190,12 @@ class SyncService:
             Tuple of (success_count, error_count)
         """
         todos = self.todo_repo.list_all(limit=10000)
-        success_count = 0
-        error_count = 0
-
-        for todo in todos:
-            if self.sync_todo(todo.id):
-                success_count += 1
-            else:
-                error_count += 1
-
-        return success_count, error_count
+        return self._sync_in_batches(
+            [_todo_payload(todo) for todo in todos],
+            self.vector_store.upsert_todos,
+            self.vector_store.upsert_todo,
+            "todo_id",
+        )
 
     def full_sync_notes(self) -> tuple[int, int]:
         """
@@ -105,14 +205,41 @@ class SyncService:
             Tuple of (success_count, error_count)
         """
         notes = self.note_repo.list_all(limit=10000)
+        return self._sync_in_batches(
+            [_note_payload(note) for note in notes],
+            self.vector_store.upsert_notes,
+            self.vector_store.upsert_note,
+            "note_id",
+        )
+
+    def _sync_in_batches(self, payloads, upsert_many, upsert_one, id_key: str) -> tuple[int, int]:
+        """
+        Upsert payloads FULL_SYNC_BATCH_SIZE at a time.
+
+        A batch that fails is retried one item at a time, so a single bad row
+        only costs its own sync.
+
+        Returns:
+            Tuple of (success_count, error_count)
+        """
         success_count = 0
         error_count = 0
 
-        for note in notes:
-            if self.sync_note(note.id):
-                success_count += 1
-            else:
-                error_count += 1
+        for batch in batched(payloads, FULL_SYNC_BATCH_SIZE):
+            try:
+                upsert_many(list(batch))
+                success_count += len(batch)
+                continue
+            except Exception as e:
+                print(f"Error syncing batch of {len(batch)}, retrying one by one: {e}")
+
+            for payload in batch:
+                try:
+                    upsert_one(**payload)
+                    success_count += 1
+                except Exception as e:
+                    print(f"Error syncing {id_key} {payload[id_key]}: {e}")
+                    error_count += 1
 
         return success_count, error_count
 
@@ -125,8 +252,12 @@ class SyncService:
         """
         print("Starting full synchronization...")
 
-        todo_success, todo_errors = self.full_sync_todos()
-        note_success, note_errors = self.full_sync_notes()
+        # Todos and notes sync concurrently; the embedding and Chroma calls release the GIL
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            todo_future = executor.submit(self._run_in_own_session, SyncService.full_sync_todos)
+            note_future = executor.submit(self._run_in_own_session, SyncService.full_sync_notes)
+            todo_success, todo_errors = todo_future.result()
+            note_success, note_errors = note_future.result()
 
         stats = {
             "todos": {"success": todo_success, "errors": todo_errors},
@@ -147,6 +278,14 @@ class SyncService:
 
         return stats
 
+    def _run_in_own_session(self, sync: Callable[["SyncService"], tuple[int, int]]) -> tuple[int, int]:
+        """Run a sync method on a worker service with its own session (sessions aren't thread-safe)."""
+        worker = SyncService(vector_store=self.vector_store)
+        try:
+            return sync(worker)
+        finally:
+            worker.close()
+
     def verify_consistency(self) -> dict:
         """
         Verify consistency between database and vector store.
@@ -154,28 +293,16 @@ class SyncService:
         Returns:
             Dictionary with consistency check results
         """
-        # Get all todos from DB
-        todos = self.todo_repo.list_all(limit=10000)
-        notes = self.note_repo.list_all(limit=10000)
-
-        # Check if they exist in vector store
-        missing_todos = []
-        missing_notes = []
-
-        for todo in todos:
-            # Simple check: search for exact content
-            results = self.vector_store.search_todos(todo.content, k=1)
-            if not results or results[0]["todo_id"] != todo.id:
-                missing_todos.append(todo.id)
+        # Compare the IDs in the DB against the IDs in the vector store
+        todo_ids = self.todo_repo.list_ids()
+        note_ids = self.note_repo.list_ids()
 
-        for note in notes:
-            results = self.vector_store.search_notes(note.content[:100], k=1)
-            if not results or results[0]["note_id"] != note.id:
-                missing_notes.append(note.id)
+        missing_todos = sorted(todo_ids - self.vector_store.list_ids("todos"))
+        missing_notes = sorted(note_ids - self.vector_store.list_ids("notes"))
 
         return {
-            "total_todos": len(todos),
-            "total_notes": len(notes),
+            "total_todos": len(todo_ids),
+            "total_notes": len(note_ids),
             "missing_todos": missing_todos,
             "missing_notes": missing_notes,
             "consistent": len(missing_todos) == 0 and len(missing_notes) == 0,
@@ -1,11 +1,12 @@
 """Todo service with database and vector store operations."""
 
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
 from terminal_todos.db.connection import get_session
 from terminal_todos.db.models import Todo
 from terminal_todos.db.repositories import EventRepository, TodoRepository
-from terminal_todos.core.sync_service import SyncService
+from terminal_todos.core.sync_service import SyncService, flush_pending_todo_syncs
 from terminal_todos.vector.search import SemanticSearch
 
 
@@ -108,17 +109,19 @@ class TodoService:
 
     def delete_todo(self, todo_id: int) -> bool:
         """Delete a todo and remove from vector store."""
-        # Log before deleting
-        todo = self.todo_repo.get(todo_id)
-        if not todo:
-            return False
+        return self.delete_todo_returning_content(todo_id) is not None
 
-        content = todo.content
+    def delete_todo_returning_content(self, todo_id: int) -> Optional[str]:
+        """
+        Delete a todo and remove from vector store.
 
-        # Delete from database
-        deleted = self.todo_repo.delete(todo_id)
+        Returns:
+            The deleted todo's content, or None if it didn't exist
+        """
+        # Delete from database, fetching the content in the same statement
+        content = self.todo_repo.delete_returning_content(todo_id)
 
-        if deleted:
+        if content is not None:
             # Remove from vector store
             self.sync_service.remove_todo(todo_id)
 
@@ -130,7 +133,25 @@ class TodoService:
                 details={"content": content},
             )
 
-        return deleted
+        return content
+
+    def delete_todos_bulk(self, todo_ids: List[int]) -> int:
+        """Delete several todos in one batch and remove them from the vector store."""
+        # Delete from database in one statement, getting back what was deleted
+        deleted = self.todo_repo.delete_many(todo_ids)
+
+        if deleted:
+            # Remove from vector store in one call
+            self.sync_service.remove_todos(list(deleted))
+
+            # Log events in one commit
+            self.event_repo.log_events(
+                event_type="todo_deleted",
+                entity_type="todo",
+                entries=[(todo_id, {"content": content}) for todo_id, content in deleted.items()],
+            )
+
+        return len(deleted)
 
     def search_todos(
         self,
@@ -149,6 +170,8 @@ class TodoService:
         Returns:
             List of search results with relevance scores
         """
+        # Write any debounced todo updates first so results reflect them
+        flush_pending_todo_syncs()
         return self.search.search_todos(query, k=k, completed=completed)
 
     def find_todo_by_content(self, content: str) -> Optional[Todo]:
@@ -235,6 +258,19 @@ class TodoService:
         """List todos in the focus list."""
         return self.todo_repo.list_focused()
 
+    def list_focus_candidates(self, today: date, now: datetime, limit: int = 200) -> List[Todo]:
+        """
+        List the highest-scoring active, unfocused todos for focus suggestions.
+
+        Only todos that are due within a week (or overdue), high/urgent
+        priority, or more than a week old score above 0 and are returned.
+        """
+        return self.todo_repo.list_focus_candidates(
+            today_start=datetime.combine(today, datetime.min.time()),
+            now=now,
+            limit=limit,
+        )
+
     def add_to_focus(self, todo_id: int) -> Optional[Todo]:
         """Add a todo to the focus list."""
         todo = self.todo_repo.add_to_focus(todo_id)
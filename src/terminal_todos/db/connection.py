@@ -4,6 +4,7 @@ from typing import Optional
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from terminal_todos.config import get_settings
 from terminal_todos.db.models import Base
@@ -23,6 +24,8 @@ def get_engine():
             db_url,
             echo=False,  # Set to True for SQL debugging
             connect_args={"check_same_thread": False},  # Needed for SQLite
+            poolclass=QueuePool,  # Reuse connections across sessions
+            pool_size=8,
         )
     return _engine
 
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from terminal_todos.db.connection import get_engine, get_session, init_db
 from terminal_todos.db.models import Base, Metadata
 
-CURRENT_SCHEMA_VERSION = 6
+CURRENT_SCHEMA_VERSION = 7
 
 
 class Migration:
@@ -170,6 +170,25 @@ def migration_v6_add_emails_table(session: Session) -> None:
         session.rollback()
 
 
+def migration_v7_add_todo_focus_index(session: Session) -> None:
+    """Add composite index on todos for active/focus/due-date queries."""
+    from sqlalchemy import text
+
+    try:
+        session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_todos_completed_focus_due "
+                "ON todos (completed, focus_order, due_date)"
+            )
+        )
+        session.commit()
+        print("  Created ix_todos_completed_focus_due index")
+
+    except Exception as e:
+        print(f"  Warning: Could not create todos index: {e}")
+        session.rollback()
+
+
 # List of all migrations in order
 MIGRATIONS: List[Migration] = [
     Migration(
@@ -202,6 +221,11 @@ MIGRATIONS: List[Migration] = [
         description="Add emails table",
         up=migration_v6_add_emails_table,
     ),
+    Migration(
+        version=7,
+        description="Add todos completed/focus/due_date index",
+        up=migration_v7_add_todo_focus_index,
+    ),
 ]
 
 
@@ -2,10 +2,21 @@
 
 import json
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import DeclarativeBase, relationship
+import orjson
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, query_expression, relationship
+
+
+@lru_cache(maxsize=4096)
+def _parse_json_list(raw: str) -> tuple:
+    """Parse a JSON array column; cached by value, so a note's lists decode once."""
+    try:
+        return tuple(orjson.loads(raw))
+    except (orjson.JSONDecodeError, TypeError):
+        return ()
 
 
 class Base(DeclarativeBase):
@@ -32,6 +43,10 @@ class Todo(Base):
     # Relationships
     note = relationship("Note", back_populates="todos")
 
+    __table_args__ = (
+        Index("ix_todos_completed_focus_due", "completed", "focus_order", "due_date"),
+    )
+
     def __repr__(self) -> str:
         status = "✓" if self.completed else "○"
         return f"<Todo {self.id}: {status} {self.content[:50]}>"
@@ -58,6 +73,9 @@ class Note(Base):
     category = Column(String, nullable=True)  # Primary category
     tags = Column(Text, nullable=True)  # JSON array of strings (accounts, clients, projects)
 
+    # Start of content, only loaded by NoteRepository.list_previews
+    content_preview = query_expression()
+
     # Relationships
     todos = relationship("Todo", back_populates="note")
 
@@ -66,12 +84,7 @@ class Note(Base):
 
     def get_keywords(self) -> List[str]:
         """Parse keywords from JSON string."""
-        if self.keywords:
-            try:
-                return json.loads(self.keywords)
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        return list(_parse_json_list(self.keywords)) if self.keywords else []
 
     def set_keywords(self, keywords: List[str]) -> None:
         """Store keywords as JSON string."""
@@ -82,12 +95,7 @@ class Note(Base):
 
     def get_topics(self) -> List[str]:
         """Parse topics from JSON string."""
-        if self.topics:
-            try:
-                return json.loads(self.topics)
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        return list(_parse_json_list(self.topics)) if self.topics else []
 
     def set_topics(self, topics: List[str]) -> None:
         """Store topics as JSON string."""
@@ -98,12 +106,7 @@ class Note(Base):
 
     def get_tags(self) -> List[str]:
         """Parse tags from JSON string."""
-        if self.tags:
-            try:
-                return json.loads(self.tags)
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        return list(_parse_json_list(self.tags)) if self.tags else []
 
     def set_tags(self, tags: List[str]) -> None:
         """Store tags as JSON string."""
@@ -1,15 +1,47 @@
 """Repository pattern for data access."""
 
 import json
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func
+from sqlalchemy.orm import Session, defer, with_expression
 
 from terminal_todos.db.models import Email, Event, Note, Todo
 
 
+def _focus_score(today_start: datetime, now: datetime):
+    """
+    SQL expression for a todo's focus-suggestion score.
+
+    Mirrors the scoring in agent.tools.suggest_focus_todos: due date
+    (overdue 100, today 80, tomorrow 60, within 3 days 40, within a week 20),
+    priority (urgent 50, high 30) and age (over 30 days 25, 14 days 15, 7 days 5).
+    """
+    due = case(
+        (Todo.due_date < today_start, 100),
+        (Todo.due_date < today_start + timedelta(days=1), 80),
+        (Todo.due_date < today_start + timedelta(days=2), 60),
+        (Todo.due_date < today_start + timedelta(days=4), 40),
+        (Todo.due_date < today_start + timedelta(days=8), 20),
+        else_=0,
+    )
+    priority = case((Todo.priority >= 2, 50), (Todo.priority == 1, 30), else_=0)
+    age = case(
+        (Todo.created_at <= now - timedelta(days=31), 25),
+        (Todo.created_at <= now - timedelta(days=15), 15),
+        (Todo.created_at <= now - timedelta(days=8), 5),
+        else_=0,
+    )
+    return due + priority + age
+
+
+def _start_of_today() -> datetime:
+    """Get midnight at the start of the current local day."""
+    today = date.today()
+    return datetime(today.year, today.month, today.day)
+
+
 class TodoRepository:
     """Repository for Todo operations."""
 
@@ -34,6 +66,12 @@ class TodoRepository:
         """Get a todo by ID."""
         return self.session.query(Todo).filter(Todo.id == todo_id).first()
 
+    def get_many(self, todo_ids: List[int]) -> List[Todo]:
+        """Get several todos by ID in one query (missing IDs are skipped)."""
+        if not todo_ids:
+            return []
+        return self.session.query(Todo).filter(Todo.id.in_(todo_ids)).all()
+
     def list_active(self, limit: int = 100) -> List[Todo]:
         """List active (not completed) todos."""
         return (
@@ -109,6 +147,27 @@ class TodoRepository:
             return True
         return False
 
+    def delete_returning_content(self, todo_id: int) -> Optional[str]:
+        """Delete a todo in one statement. Returns its content, or None if not found."""
+        content = self.session.execute(
+            delete(Todo).where(Todo.id == todo_id).returning(Todo.content)
+        ).scalar_one_or_none()
+        self.session.commit()
+        return content
+
+    def delete_many(self, todo_ids: List[int]) -> Dict[int, str]:
+        """Delete several todos in one statement. Returns the content of each deleted todo by ID."""
+        if not todo_ids:
+            return {}
+        rows = self.session.execute(
+            delete(Todo)
+            .where(Todo.id.in_(todo_ids))
+            .returning(Todo.id, Todo.content)
+            .execution_options(synchronize_session=False)
+        ).all()
+        self.session.commit()
+        return {todo_id: content for todo_id, content in rows}
+
     def get_by_content(self, content: str) -> Optional[Todo]:
         """Get a todo by exact content match."""
         return self.session.query(Todo).filter(Todo.content == content).first()
@@ -124,15 +183,14 @@ class TodoRepository:
 
     def list_due_today(self) -> List[Todo]:
         """List todos due today."""
-        from datetime import date
-        today = date.today()
+        today = _start_of_today()
         return (
             self.session.query(Todo)
             .filter(
                 Todo.completed == False,
                 Todo.due_date.isnot(None),
-                Todo.due_date >= datetime(today.year, today.month, today.day),
-                Todo.due_date < datetime(today.year, today.month, today.day + 1)
+                Todo.due_date >= today,
+                Todo.due_date < today + timedelta(days=1)
             )
             .order_by(Todo.priority.desc(), Todo.due_date.asc())
             .all()
@@ -140,16 +198,14 @@ class TodoRepository:
 
     def list_due_this_week(self) -> List[Todo]:
         """List todos due this week."""
-        from datetime import date, timedelta
-        today = date.today()
-        week_end = today + timedelta(days=7)
+        today = _start_of_today()
         return (
             self.session.query(Todo)
             .filter(
                 Todo.completed == False,
                 Todo.due_date.isnot(None),
-                Todo.due_date >= datetime(today.year, today.month, today.day),
-                Todo.due_date < datetime(week_end.year, week_end.month, week_end.day)
+                Todo.due_date >= today,
+                Todo.due_date < today + timedelta(days=7)
             )
             .order_by(Todo.priority.desc(), Todo.due_date.asc())
             .all()
@@ -157,14 +213,12 @@ class TodoRepository:
 
     def list_overdue(self) -> List[Todo]:
         """List overdue todos."""
-        from datetime import date
-        today = date.today()
         return (
             self.session.query(Todo)
             .filter(
                 Todo.completed == False,
                 Todo.due_date.isnot(None),
-                Todo.due_date < datetime(today.year, today.month, today.day)
+                Todo.due_date < _start_of_today()
             )
             .order_by(Todo.priority.desc(), Todo.due_date.asc())
             .all()
@@ -210,6 +264,39 @@ class TodoRepository:
             .all()
         )
 
+    def list_ids(self) -> set[int]:
+        """Get the IDs of all todos."""
+        return {todo_id for (todo_id,) in self.session.query(Todo.id).all()}
+
+    def list_focus_candidates(
+        self, today_start: datetime, now: datetime, limit: int = 200
+    ) -> List[Todo]:
+        """
+        List the highest-scoring active, unfocused todos for focus suggestions.
+
+        Todos are ranked by the same score suggest_focus_todos uses (see
+        _focus_score) before the limit is applied, so the shortlist is the
+        top-scoring set. Todos that score 0 are left out.
+        """
+        score = _focus_score(today_start, now)
+        return (
+            self.session.query(Todo)
+            .filter(
+                Todo.completed == False,
+                Todo.focus_order.is_(None),
+                score > 0,
+            )
+            .order_by(
+                score.desc(),
+                Todo.due_date.is_(None),
+                Todo.due_date.asc(),
+                Todo.priority.desc(),
+                Todo.created_at.asc(),
+            )
+            .limit(limit)
+            .all()
+        )
+
     def add_to_focus(self, todo_id: int) -> Optional[Todo]:
         """Add a todo to the focus list with next available order."""
         todo = self.get(todo_id)
@@ -272,6 +359,20 @@ class NoteRepository:
         """Get a note by ID."""
         return self.session.query(Note).filter(Note.id == note_id).first()
 
+    def get_many(self, note_ids: List[int]) -> List[Note]:
+        """Get several notes by ID in one query (missing IDs are skipped)."""
+        if not note_ids:
+            return []
+        return self.session.query(Note).filter(Note.id.in_(note_ids)).all()
+
+    def count(self) -> int:
+        """Count all notes."""
+        return self.session.query(func.count(Note.id)).scalar() or 0
+
+    def list_ids(self) -> set[int]:
+        """Get the IDs of all notes."""
+        return {note_id for (note_id,) in self.session.query(Note.id).all()}
+
     def list_all(self, limit: int = 100) -> List[Note]:
         """List all notes."""
         return (
@@ -281,6 +382,35 @@ class NoteRepository:
             .all()
         )
 
+    def list_by_type(self, note_type: str, limit: int = 100) -> List[Note]:
+        """List the most recent notes of a type."""
+        return (
+            self.session.query(Note)
+            .filter(Note.note_type == note_type)
+            .order_by(Note.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def list_previews(self, limit: int = 100, preview_len: int = 100) -> List[Note]:
+        """
+        List recent notes without loading their full content.
+
+        note.content_preview holds the first preview_len + 1 characters, so
+        callers can tell whether the preview was truncated.
+        """
+        return (
+            self.session.query(Note)
+            .options(
+                defer(Note.content),
+                with_expression(Note.content_preview, func.substr(Note.content, 1, preview_len + 1)),
+            )
+            .order_by(Note.created_at.desc())
+            .limit(limit)
+            .execution_options(populate_existing=True)
+            .all()
+        )
+
     def delete(self, note_id: int) -> bool:
         """Delete a note."""
         note = self.get(note_id)
@@ -388,6 +518,24 @@ class EventRepository:
         self.session.refresh(event)
         return event
 
+    def log_events(
+        self,
+        event_type: str,
+        entity_type: str,
+        entries: List[tuple[int, Optional[dict]]],
+    ) -> None:
+        """Log several events of the same type in one commit."""
+        self.session.add_all(
+            Event(
+                event_type=event_type,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                details=json.dumps(details) if details else None,
+            )
+            for entity_id, details in entries
+        )
+        self.session.commit()
+
     def get_recent(self, limit: int = 50) -> List[Event]:
         """Get recent events."""
         return (
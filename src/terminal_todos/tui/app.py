@@ -23,6 +23,10 @@ from terminal_todos.agent.graph import get_agent_graph
 from terminal_todos.extraction.todo_extractor import TodoExtractor
 from langchain_core.messages import HumanMessage
 
+# Todo priority display
+_PRIORITY_LABELS = {0: "", 1: " [HIGH]", 2: " [URGENT]"}
+_PRIORITY_COLORS = {0: "white", 1: "yellow", 2: "red"}
+
 
 class TodosApp(App):
     """Terminal Todos TUI application."""
@@ -468,7 +472,7 @@ class TodosApp(App):
                 )
                 created_count += 1
 
-                priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(priority, "")
+                priority_label = _PRIORITY_LABELS.get(priority, "")
                 chat_log.write_success(f"✓ Created todo #{todo.id}: {todo_content}{priority_label}")
 
             # Reload todos in the list
@@ -550,7 +554,7 @@ class TodosApp(App):
                 todo = self.todo_service.add_to_focus(todo_id)
                 if todo:
                     added_count += 1
-                    priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(todo.priority, "")
+                    priority_label = _PRIORITY_LABELS.get(todo.priority, "")
                     due_label = f" (due {todo.due_date.strftime('%m/%d')})" if todo.due_date else ""
                     chat_log.write_success(f"⭐ Added to focus: #{todo.id} {todo.content}{priority_label}{due_label}")
                 else:
@@ -786,7 +790,7 @@ Just type naturally (no / prefix) to chat with the AI:
             else:
                 chat_log.write_success(f"⭐ Focus List ({len(focused)} items):")
                 for todo in focused:
-                    priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(todo.priority, "")
+                    priority_label = _PRIORITY_LABELS.get(todo.priority, "")
                     due_label = f" (due {todo.due_date.strftime('%m/%d')})" if todo.due_date else ""
                     chat_log.write_system(f"  #{todo.id}: {todo.content}{priority_label}{due_label}")
             return
@@ -836,7 +840,7 @@ Just type naturally (no / prefix) to chat with the AI:
                 else:
                     chat_log.write_success(f"⭐ Focus List ({len(focused)} items):")
                     for todo in focused:
-                        priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(todo.priority, "")
+                        priority_label = _PRIORITY_LABELS.get(todo.priority, "")
                         due_label = f" (due {todo.due_date.strftime('%m/%d')})" if todo.due_date else ""
                         chat_log.write_system(f"  #{todo.id}: {todo.content}{priority_label}{due_label}")
 
@@ -1786,7 +1790,8 @@ Just paste and press **Ctrl+Enter** - the AI will organize everything!
             # Show success for each
             for note in created_notes:
                 category_display = f"[{note.category.upper()}] " if note.category else ""
-                tags_display = f" 🏷️ {', '.join(note.get_tags())}" if note.get_tags() else ""
+                tags = note.get_tags()
+                tags_display = f" 🏷️ {', '.join(tags)}" if tags else ""
                 chat_log.write_success(f"✓ Imported #{note.id}: {category_display}{note.title}{tags_display}")
 
             # Clear loading
@@ -1871,11 +1876,7 @@ Just paste and press **Ctrl+Enter** - the AI will organize everything!
             chat_log.write_system(f"\n📋 Found {len(extracted_todo_strings)} actionable todo(s):\n")
 
             for i, todo in enumerate(extracted_todo_strings):
-                priority_label = ""
-                if self.pending_extracted_priorities[i] == 1:
-                    priority_label = " [HIGH]"
-                elif self.pending_extracted_priorities[i] == 2:
-                    priority_label = " [URGENT]"
+                priority_label = _PRIORITY_LABELS.get(self.pending_extracted_priorities[i], "")
 
                 chat_log.write_system(f"  {i+1}. {todo}{priority_label}")
 
@@ -2365,8 +2366,21 @@ Just paste and press **Ctrl+Enter** - the AI will organize everything!
 
             await asyncio.sleep(0.15)
 
-            # Stream with full conversation history
-            for chunk in self.agent_graph.stream({"messages": self.conversation_history}):
+            # Stream with full conversation history. "updates" yields the
+            # output of each node; "messages" yields LLM tokens as they arrive
+            streamed_tokens = 0
+            async for stream_mode, chunk in self.agent_graph.astream(
+                {"messages": self.conversation_history},
+                stream_mode=["updates", "messages"],
+            ):
+                if stream_mode == "messages":
+                    # Show response progress while the agent is generating
+                    token, metadata = chunk
+                    if metadata.get("langgraph_node") == "agent" and token.content:
+                        streamed_tokens += 1
+                        chat_log.set_streaming_state(streamed_tokens)
+                    continue
+
                 # Check if this chunk contains tool calls
                 if "agent" in chunk:
                     agent_messages = chunk["agent"]["messages"]
@@ -2530,7 +2544,7 @@ Just paste and press **Ctrl+Enter** - the AI will organize everything!
                     return result
             else:
                 # Fallback to invoke if streaming doesn't work
-                fallback_result = self.agent_graph.invoke({"messages": self.conversation_history})
+                fallback_result = await self.agent_graph.ainvoke({"messages": self.conversation_history})
 
                 # Add AI response to history from fallback
                 if fallback_result and "messages" in fallback_result:
@@ -2580,7 +2594,7 @@ Just paste and press **Ctrl+Enter** - the AI will organize everything!
 
         try:
             # Call agent with full conversation history
-            result = self.agent_graph.invoke({"messages": self.conversation_history})
+            result = await self.agent_graph.ainvoke({"messages": self.conversation_history})
 
             # Extract assistant's response and add to history
             if result and "messages" in result:
@@ -2691,10 +2705,8 @@ Just paste and press **Ctrl+Enter** - the AI will organize everything!
 
                 # Show each extracted todo for review
                 for i, extracted_todo in enumerate(extraction.todos, 1):
-                    priority_label = {0: "", 1: " [HIGH]", 2: " [URGENT]"}.get(
-                        extracted_todo.priority, ""
-                    )
-                    priority_color = {0: "white", 1: "yellow", 2: "red"}.get(extracted_todo.priority, "white")
+                    priority_label = _PRIORITY_LABELS.get(extracted_todo.priority, "")
+                    priority_color = _PRIORITY_COLORS.get(extracted_todo.priority, "white")
 
                     todo_text = Text()
                     todo_text.append(f"{i}. ", style="dim")
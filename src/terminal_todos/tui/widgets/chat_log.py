@@ -121,6 +121,10 @@ class ChatLogWidget(RichLog):
         else:
             self.border_title = "Chat & Output"
 
+    def set_streaming_state(self, token_count: int):
+        """Update border title to show the assistant response streaming in."""
+        self.border_title = f"Chat & Output - ✍️  Responding... ({token_count} tokens)"
+
     def write_thinking(self, message: str, substep: str = None):
         """Write an agent thinking/reasoning message with special formatting."""
         timestamp = datetime.now().strftime("%H:%M")
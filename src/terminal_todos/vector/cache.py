@@ -0,0 +1,147 @@
+"""Result cache for vector searches."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from terminal_todos.config import get_settings
+
+
+class SearchCache:
+    """
+    LRU cache of search results with a semantic second tier.
+
+    Exact repeats of a query hit by key. On a miss, the query embedding is
+    compared against cached queries with the same search parameters, and a
+    cached result is reused if the cosine similarity exceeds the threshold
+    (paraphrases like "meeting notes" / "notes from meetings").
+
+    Entries expire after ttl seconds and the whole cache is cleared whenever
+    the underlying collection changes. Each clear bumps a mutation version;
+    a search passes the version it started under to put(), so results read
+    before a write that finished mid-search are never cached.
+    """
+
+    def __init__(self, max_size: int, ttl: float, similarity: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity = similarity
+        # key -> (params, unit embedding, results, stored_at)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Mutation version; read it before querying the collection."""
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Get cached results for an exact query key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[3] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return _copy_results(entry[2])
+
+    def get_similar(
+        self, params: Hashable, embedding: List[float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get cached results for the most similar query with the same params."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry[0] == params and now - entry[3] <= self.ttl
+            ]
+            if not candidates:
+                return None
+
+            query = _unit(embedding)
+            scores = np.stack([entry[1] for _, entry in candidates]) @ query
+            best = int(np.argmax(scores))
+            if scores[best] <= self.similarity:
+                return None
+
+            key, entry = candidates[best]
+            self._entries.move_to_end(key)
+            return _copy_results(entry[2])
+
+    def put(
+        self,
+        key: Hashable,
+        params: Hashable,
+        embedding: List[float],
+        results: List[Dict[str, Any]],
+        version: Optional[int] = None,
+    ) -> None:
+        """Cache results for a query, unless the collection changed since version."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = (params, _unit(embedding), _copy_results(results), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results (call after the collection is written)."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+def _unit(embedding: List[float]) -> np.ndarray:
+    """Normalize an embedding so a dot product gives cosine similarity."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _copy_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy result dicts so callers can annotate them without touching the cache."""
+    return [dict(result) for result in results]
+
+
+# One cache per collection, shared by every VectorStore instance
+_caches: Dict[str, SearchCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_search_cache(collection: str, similarity: Optional[float] = None) -> SearchCache:
+    """
+    Get the search cache for a collection.
+
+    similarity overrides the configured threshold; it only applies when the
+    cache is first created.
+    """
+    cache = _caches.get(collection)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(collection)
+            if cache is None:
+                settings = get_settings()
+                cache = SearchCache(
+                    max_size=settings.search_cache_size,
+                    ttl=settings.search_cache_ttl,
+                    similarity=settings.search_cache_similarity if similarity is None else similarity,
+                )
+                _caches[collection] = cache
+    return cache
+
+
+def clear_search_caches() -> None:
+    """Clear the search caches of all collections."""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
@@ -1,12 +1,13 @@
 """ChromaDB vector store operations."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 
 from terminal_todos.config import get_settings
-from terminal_todos.vector.embeddings import embed_text
+from terminal_todos.vector.cache import clear_search_caches, get_search_cache
+from terminal_todos.vector.embeddings import embed_text, embed_texts
 
 # Global ChromaDB client
 _client: Optional[chromadb.PersistentClient] = None
@@ -40,7 +41,13 @@ class VectorStore:
 
     # Todo operations
     def upsert_todo(
-        self, todo_id: int, content: str, completed: bool, created_at: str
+        self,
+        todo_id: int,
+        content: str,
+        completed: bool,
+        created_at: str,
+        priority: int = 0,
+        due_date: Optional[str] = None,
     ) -> None:
         """Upsert a todo to the vector store."""
         embedding = embed_text(content)
@@ -55,9 +62,39 @@ class VectorStore:
                     "todo_id": todo_id,
                     "completed": completed,
                     "created_at": created_at,
+                    "priority": priority,
+                    "due_date": due_date or "",  # Chroma metadata can't hold None
                 }
             ],
         )
+        get_search_cache("todos").clear()
+
+    def upsert_todos(self, todos: List[Dict[str, Any]]) -> None:
+        """
+        Upsert several todos in one call, embedding their contents as a batch.
+
+        Each item has the same keys as the upsert_todo arguments.
+        """
+        if not todos:
+            return
+
+        embeddings = embed_texts([todo["content"] for todo in todos])
+        self.todos_collection.upsert(
+            ids=[f"todo_{todo['todo_id']}" for todo in todos],
+            embeddings=embeddings,
+            documents=[todo["content"] for todo in todos],
+            metadatas=[
+                {
+                    "todo_id": todo["todo_id"],
+                    "completed": todo["completed"],
+                    "created_at": todo["created_at"],
+                    "priority": todo.get("priority", 0),
+                    "due_date": todo.get("due_date") or "",
+                }
+                for todo in todos
+            ],
+        )
+        get_search_cache("todos").clear()
 
     def delete_todo(self, todo_id: int) -> None:
         """Delete a todo from the vector store."""
@@ -67,6 +104,18 @@ class VectorStore:
         except Exception:
             # Todo might not exist in vector store
             pass
+        get_search_cache("todos").clear()
+
+    def delete_todos(self, todo_ids: List[int]) -> None:
+        """Delete several todos from the vector store in one call."""
+        if not todo_ids:
+            return
+        try:
+            self.todos_collection.delete(ids=[f"todo_{todo_id}" for todo_id in todo_ids])
+        except Exception:
+            # Todos might not exist in vector store
+            pass
+        get_search_cache("todos").clear()
 
     def search_todos(
         self,
@@ -75,7 +124,17 @@ class VectorStore:
         completed: Optional[bool] = None,
     ) -> List[Dict[str, Any]]:
         """Search todos semantically."""
+        cache = get_search_cache("todos")
+        version = cache.version
+        params = (k, completed)
+        cached = cache.get((query,) + params)
+        if cached is not None:
+            return cached
+
         query_embedding = embed_text(query)
+        cached = cache.get_similar(params, query_embedding)
+        if cached is not None:
+            return cached
 
         # Build where filter
         where = {}
@@ -104,6 +163,7 @@ class VectorStore:
                     }
                 )
 
+        cache.put((query,) + params, params, query_embedding, formatted_results, version)
         return formatted_results
 
     # Note operations
@@ -123,52 +183,43 @@ class VectorStore:
         tags: Optional[List[str]] = None,
     ) -> None:
         """Upsert a note to the vector store with enhanced metadata."""
-        # Combine title, summary, and content for better search
-        search_parts = []
-        if title:
-            search_parts.append(title)
-        if summary:
-            search_parts.append(summary)
-        search_parts.append(content)
-        search_text = "\n".join(search_parts)
-
-        embedding = embed_text(search_text)
-        doc_id = f"note_{note_id}"
+        self.upsert_notes(
+            [
+                {
+                    "note_id": note_id,
+                    "content": content,
+                    "title": title,
+                    "created_at": created_at,
+                    "note_type": note_type,
+                    "category": category,
+                    "keywords": keywords,
+                    "topics": topics,
+                    "summary": summary,
+                    "updated_at": updated_at,
+                    "tags": tags,
+                }
+            ]
+        )
 
-        # Build rich metadata
-        metadata = {
-            "note_id": note_id,
-            "title": title or "",
-            "original_content": content,  # IMPORTANT: Store original content separately
-            "created_at": created_at,
-        }
-
-        # Add new fields if provided
-        if note_type:
-            metadata["note_type"] = note_type
-        if category:
-            metadata["category"] = category
-        if updated_at:
-            metadata["updated_at"] = updated_at
-        if summary:
-            metadata["summary_preview"] = summary[:200]  # First 200 chars
-
-        # Store keywords, topics, and tags as comma-separated for filtering
-        if keywords:
-            metadata["keywords"] = ",".join(keywords)
-        if topics:
-            metadata["topics"] = ",".join(topics)
-        if tags:
-            metadata["tags"] = ",".join(tags)
+    def upsert_notes(self, notes: List[Dict[str, Any]]) -> None:
+        """
+        Upsert several notes in one call, embedding their search texts as a batch.
+
+        Each item has the same keys as the upsert_note arguments.
+        """
+        if not notes:
+            return
 
         # Store the full search text (title + summary + content) as the document
         # This ensures that when results are returned, the full context is available
+        search_texts = [_note_search_text(note) for note in notes]
         self.notes_collection.upsert(
-            ids=[doc_id],
-            embeddings=[embedding],
-            documents=[search_text],  # Use full search text, not just content
-            metadatas=[metadata],
+            ids=[f"note_{note['note_id']}" for note in notes],
+            embeddings=embed_texts(search_texts),
+            documents=search_texts,
+            metadatas=[_note_metadata(note) for note in notes],
         )
+        get_search_cache("notes").clear()
 
     def delete_note(self, note_id: int) -> None:
         """Delete a note from the vector store."""
@@ -178,6 +229,7 @@ class VectorStore:
         except Exception:
             # Note might not exist in vector store
             pass
+        get_search_cache("notes").clear()
 
     def search_notes(
         self,
@@ -187,7 +239,17 @@ class VectorStore:
         keywords: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """Search notes semantically with optional filters."""
+        cache = get_search_cache("notes")
+        version = cache.version
+        params = (k, category, tuple(keywords) if keywords else None)
+        cached = cache.get((query,) + params)
+        if cached is not None:
+            return cached
+
         query_embedding = embed_text(query)
+        cached = cache.get_similar(params, query_embedding)
+        if cached is not None:
+            return cached
 
         # Build where filter for category
         where = {}
@@ -232,11 +294,64 @@ class VectorStore:
             # Trim to requested size
             formatted_results = formatted_results[:k]
 
+        cache.put((query,) + params, params, query_embedding, formatted_results, version)
         return formatted_results
 
+    def list_ids(self, collection: str) -> Set[int]:
+        """
+        Get the todo or note IDs stored in a collection ("todos" or "notes").
+
+        Reads only the document IDs - no embeddings, documents or metadata.
+        """
+        chroma_collection = self.todos_collection if collection == "todos" else self.notes_collection
+        doc_ids = chroma_collection.get(include=[])["ids"]
+        return {int(doc_id.split("_", 1)[1]) for doc_id in doc_ids}
+
     def reset(self) -> None:
         """Reset all collections (for testing)."""
         self.client.delete_collection("todos")
         self.client.delete_collection("notes")
         self.todos_collection = get_or_create_collection("todos")
         self.notes_collection = get_or_create_collection("notes")
+        clear_search_caches()
+
+
+def _note_search_text(note: Dict[str, Any]) -> str:
+    """Combine title, summary, and content for better search."""
+    search_parts = []
+    if note.get("title"):
+        search_parts.append(note["title"])
+    if note.get("summary"):
+        search_parts.append(note["summary"])
+    search_parts.append(note["content"])
+    return "\n".join(search_parts)
+
+
+def _note_metadata(note: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the Chroma metadata for a note."""
+    metadata = {
+        "note_id": note["note_id"],
+        "title": note.get("title") or "",
+        "original_content": note["content"],  # IMPORTANT: Store original content separately
+        "created_at": note["created_at"],
+    }
+
+    # Add new fields if provided
+    if note.get("note_type"):
+        metadata["note_type"] = note["note_type"]
+    if note.get("category"):
+        metadata["category"] = note["category"]
+    if note.get("updated_at"):
+        metadata["updated_at"] = note["updated_at"]
+    if note.get("summary"):
+        metadata["summary_preview"] = note["summary"][:200]  # First 200 chars
+
+    # Store keywords, topics, and tags as comma-separated for filtering
+    if note.get("keywords"):
+        metadata["keywords"] = ",".join(note["keywords"])
+    if note.get("topics"):
+        metadata["topics"] = ",".join(note["topics"])
+    if note.get("tags"):
+        metadata["tags"] = ",".join(note["tags"])
+
+    return metadata
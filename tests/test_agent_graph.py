@@ -0,0 +1,60 @@
+"""Tests for the checkpointed agent graph."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
+
+from terminal_todos.agent import graph, nodes
+from terminal_todos.config import reset_settings
+
+
+class RecordingLLM:
+    """Stand-in for the tool-bound chat model that records each call's messages."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def astream(self, messages):
+        self.calls.append(list(messages))
+        yield AIMessageChunk(content="ok")
+
+
+@pytest.fixture
+def recording_llm(monkeypatch, tmp_path):
+    """Build the checkpointed graph around a RecordingLLM, without real services."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ENABLE_LLM_CACHE", "false")
+    reset_settings()
+
+    llm = RecordingLLM()
+    monkeypatch.setattr(nodes, "_build_llm_with_tools", lambda model, api_key: llm)
+    monkeypatch.setattr(graph, "TodoService", lambda: None)
+    monkeypatch.setattr(graph, "NoteService", lambda: None)
+    monkeypatch.setattr(graph, "init_tools", lambda todo_service, note_service: None)
+
+    graph.reset_agent_graph()
+    yield llm
+    graph.reset_agent_graph()
+    reset_settings()
+
+
+def test_system_prompt_sent_on_every_user_turn(recording_llm):
+    """Each user turn on a checkpointed thread starts with the system prompt."""
+    agent_graph = graph.get_checkpointed_agent_graph()
+    config = {"configurable": {"thread_id": "test-thread"}}
+
+    async def run_turns():
+        await agent_graph.ainvoke({"messages": [HumanMessage(content="list my todos")]}, config=config)
+        await agent_graph.ainvoke({"messages": [HumanMessage(content="show my notes")]}, config=config)
+
+    asyncio.run(run_turns())
+
+    assert len(recording_llm.calls) == 2
+    for messages in recording_llm.calls:
+        assert isinstance(messages[0], SystemMessage)
+        assert isinstance(messages[-1], HumanMessage)
+
+    # The second turn sees the restored history plus the new message
+    assert [m.content for m in recording_llm.calls[1][1:]] == ["list my todos", "ok", "show my notes"]